@@ -0,0 +1,260 @@
+import glob
+import json
+import os
+import sqlite3
+import time
+from threading import Lock
+
+import pandas as pd
+
+from carga_incremental import CargadorIncremental, filas_a_frame
+from modelo_evaluaciones import ENCABEZADOS_EVALUACION
+
+HOJA = "trabajadores"
+
+
+def ajustar_fila(fila, num_columnas):
+    """Rellena o recorta la fila al número de columnas de la hoja."""
+    if len(fila) < num_columnas:
+        return fila + [""] * (num_columnas - len(fila))
+    return fila[:num_columnas]
+
+
+# ===========================================================
+# INTERFAZ COMÚN DE ALMACENAMIENTO
+# ===========================================================
+class Almacenamiento:
+    """Operaciones de datos que usa la aplicación, independientes del motor.
+
+    - ``cargar(proyeccion=None)``: DataFrame crudo (texto) de la hoja, completo o
+      solo con las columnas que devuelve ``proyeccion(encabezados)`` (ver
+      ``modelo_evaluaciones.columnas_*``). Las filas nuevas se agregan al final y
+      ``attrs["generacion"]`` cambia cuando el frame se reconstruye, contrato que
+      usan el cubo y el índice de plantilla. La búsqueda de trabajadores se
+      resuelve en memoria con ``IndicePlantilla`` sobre ``cargar(columnas_plantilla)``.
+    - ``agregar_filas(filas)``: agrega evaluaciones al final (una llamada por lote).
+    """
+
+    nombre = ""
+
+    def encabezados(self):
+        raise NotImplementedError
+
+    def cargar(self, proyeccion=None):
+        raise NotImplementedError
+
+    def agregar_filas(self, filas):
+        raise NotImplementedError
+
+
+def proyectar(df, proyeccion):
+    """Columnas de ``df`` que pide la proyección, conservando la generación.
+
+    Los motores locales leen todo (es barato) y proyectan en memoria.
+    """
+    if proyeccion is None:
+        return df
+    buscadas = {c.strip() for c in proyeccion(list(df.columns)) if c}
+    resultado = df[[c for c in df.columns if c.strip() in buscadas]]
+    resultado.attrs["generacion"] = df.attrs.get("generacion")
+    return resultado
+
+
+class _FrameIncremental:
+    """Frame en memoria que crece por bloques y cuenta reconstrucciones."""
+
+    def __init__(self):
+        self.df = None
+        self.generacion = 0
+
+    def reiniciar(self, encabezados):
+        self.df = filas_a_frame([], encabezados)
+        self.generacion += 1
+
+    def anexar(self, nuevo):
+        if len(nuevo):
+            self.df = pd.concat([self.df, nuevo], ignore_index=True)
+
+    def resultado(self):
+        self.df.attrs["generacion"] = self.generacion
+        return self.df
+
+
+# ===========================================================
+# GOOGLE SHEETS
+# ===========================================================
+class AlmacenamientoSheets(Almacenamiento):
+    """Hoja "trabajadores" de Google Sheets (real o ``sheets_falso``)."""
+
+    nombre = "sheets"
+
+    def __init__(self, recursos, hoja=HOJA, ultima_columna="AP"):
+        self.recursos = recursos
+        self.hoja = hoja
+        self.ultima_columna = ultima_columna
+        self.cargadores = {}    # proyección → CargadorIncremental (cada uno con sus filas)
+        self._lock = Lock()
+
+    def encabezados(self):
+        return self.recursos.encabezados(self.hoja)  # En caché: sin llamada a la API
+
+    def cargar(self, proyeccion=None):
+        with self._lock:
+            cargador = self.cargadores.get(proyeccion)
+            if cargador is None:
+                recursos, hoja = self.recursos, self.hoja
+                cargador = self.cargadores[proyeccion] = CargadorIncremental(
+                    lambda: recursos.hoja(hoja),
+                    ultima_columna=self.ultima_columna,
+                    al_leer_encabezados=lambda encabezados: recursos.actualizar_encabezados(hoja, encabezados),
+                    proyeccion=proyeccion,
+                    # Sin encabezado en caché se asume el formato conocido (se corrige si difiere)
+                    encabezados_esperados=recursos.encabezados_en_cache(hoja) or ENCABEZADOS_EVALUACION,
+                )
+        return cargador.cargar()
+
+    def agregar_filas(self, filas):
+        num_columnas = len(self.encabezados())
+        self.recursos.spreadsheet().values_append(
+            self.hoja,
+            params={"valueInputOption": "USER_ENTERED"},
+            body={"values": [ajustar_fila(fila, num_columnas) for fila in filas]},
+        )
+
+
+# ===========================================================
+# SQLITE
+# ===========================================================
+class AlmacenamientoSQLite(Almacenamiento):
+    """Base de datos SQLite local: una columna de texto por columna de la hoja."""
+
+    nombre = "sqlite"
+
+    def __init__(self, ruta, encabezados=ENCABEZADOS_EVALUACION):
+        self._lock = Lock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        with self._conexion:
+            self._conexion.execute("CREATE TABLE IF NOT EXISTS encabezados (pos INTEGER PRIMARY KEY, nombre TEXT)")
+            if not self._conexion.execute("SELECT COUNT(*) FROM encabezados").fetchone()[0]:
+                self._conexion.executemany("INSERT INTO encabezados VALUES (?, ?)", enumerate(encabezados))
+        self._encabezados = [n for (n,) in self._conexion.execute("SELECT nombre FROM encabezados ORDER BY pos")]
+
+        columnas = ", ".join(f"c{i} TEXT" for i in range(len(self._encabezados)))
+        with self._conexion:
+            self._conexion.execute(f"CREATE TABLE IF NOT EXISTS filas (id INTEGER PRIMARY KEY AUTOINCREMENT, {columnas})")
+
+        self._frame = _FrameIncremental()
+        self._ultimo_id = 0
+
+    def encabezados(self):
+        return list(self._encabezados)
+
+    def cargar(self, proyeccion=None):
+        return proyectar(self._cargar(), proyeccion)
+
+    def _cargar(self):
+        with self._lock:
+            maximo = self._conexion.execute("SELECT COALESCE(MAX(id), 0) FROM filas").fetchone()[0]
+            if self._frame.df is None or maximo < self._ultimo_id:
+                self._frame.reiniciar(self._encabezados)
+                self._ultimo_id = 0
+            cursor = self._conexion.execute("SELECT * FROM filas WHERE id > ? ORDER BY id", (self._ultimo_id,))
+            registros = cursor.fetchall()
+            if registros:
+                self._ultimo_id = registros[-1][0]
+                nuevo = filas_a_frame([r[1:] for r in registros], self._encabezados)
+                self._frame.anexar(nuevo.fillna(""))
+            return self._frame.resultado()
+
+    def agregar_filas(self, filas):
+        num_columnas = len(self._encabezados)
+        marcadores = ", ".join("?" * num_columnas)
+        columnas = ", ".join(f"c{i}" for i in range(num_columnas))
+        with self._lock, self._conexion:
+            self._conexion.executemany(
+                f"INSERT INTO filas ({columnas}) VALUES ({marcadores})",
+                [[str(c) for c in ajustar_fila(list(fila), num_columnas)] for fila in filas],
+            )
+
+
+# ===========================================================
+# PARQUET
+# ===========================================================
+class AlmacenamientoParquet(Almacenamiento):
+    """Directorio de archivos Parquet de solo-agregar: un archivo por lote.
+
+    Requiere ``pyarrow`` (dependencia de Streamlit). ``cargar`` solo lee los
+    archivos que aparecieron desde la última lectura.
+    """
+
+    nombre = "parquet"
+
+    def __init__(self, directorio, encabezados=ENCABEZADOS_EVALUACION):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        ruta_encabezados = os.path.join(directorio, "_encabezados.json")
+        if not os.path.exists(ruta_encabezados):
+            with open(ruta_encabezados, "w", encoding="utf-8") as f:
+                json.dump(list(encabezados), f, ensure_ascii=False)
+        with open(ruta_encabezados, encoding="utf-8") as f:
+            self._encabezados = json.load(f)
+
+        self._lock = Lock()
+        self._frame = _FrameIncremental()
+        self._leidos = []
+
+    def encabezados(self):
+        return list(self._encabezados)
+
+    def _partes(self):
+        return sorted(glob.glob(os.path.join(self.directorio, "parte-*.parquet")))
+
+    def cargar(self, proyeccion=None):
+        return proyectar(self._cargar(), proyeccion)
+
+    def _cargar(self):
+        with self._lock:
+            partes = self._partes()
+            if self._frame.df is None or partes[:len(self._leidos)] != self._leidos:
+                self._frame.reiniciar(self._encabezados)
+                self._leidos = []
+            nuevas = partes[len(self._leidos):]
+            if nuevas:
+                bloques = [pd.read_parquet(ruta) for ruta in nuevas]
+                nuevo = pd.concat(bloques, ignore_index=True)
+                nuevo.columns = self._encabezados
+                self._frame.anexar(nuevo)
+                self._leidos.extend(nuevas)
+            return self._frame.resultado()
+
+    def agregar_filas(self, filas):
+        num_columnas = len(self._encabezados)
+        df = pd.DataFrame(
+            [[str(c) for c in ajustar_fila(list(fila), num_columnas)] for fila in filas],
+            columns=[f"c{i}" for i in range(num_columnas)],
+        )
+        ruta = os.path.join(self.directorio, f"parte-{time.time_ns():020d}.parquet")
+        df.to_parquet(ruta + ".tmp", index=False)
+        os.replace(ruta + ".tmp", ruta)  # Escritura atómica: nunca se lee un archivo a medias
+
+
+# ===========================================================
+# FÁBRICA
+# ===========================================================
+MOTORES = ("sheets", "sqlite", "parquet", "sheets_falso")
+
+
+def crear_almacenamiento(motor, ruta=None, recursos=None):
+    """Crea el motor configurado.
+
+    ``sheets`` y ``sheets_falso`` necesitan ``recursos`` (``RecursosSheets``);
+    ``sqlite`` y ``parquet`` usan ``ruta`` (archivo o directorio local).
+    """
+    if motor in ("sheets", "sheets_falso"):
+        return AlmacenamientoSheets(recursos)
+    if motor == "sqlite":
+        return AlmacenamientoSQLite(ruta or "evaluaciones.db")
+    if motor == "parquet":
+        return AlmacenamientoParquet(ruta or "evaluaciones_parquet")
+    raise ValueError(f"Motor de almacenamiento desconocido: {motor!r} (opciones: {', '.join(MOTORES)})")
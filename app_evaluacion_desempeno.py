@@ -1,17 +1,36 @@
 import streamlit as st
 import pandas as pd
-import gspread
 import plotly.express as px
 from google.oauth2.service_account import Credentials
 from datetime import datetime
+import atexit
+import hashlib
+import io
 import json
-import time
-from threading import Lock
+
+from almacenamiento import crear_almacenamiento
+from cola_escritura import ColaEscritura
+from cubo_evaluaciones import TODOS, CuboEvaluaciones
+from graficas import agrupar_serie, es_volumen_grande, figura_cajas, figura_evolucion_gl
+from importacion_masiva import escribir_por_bloques, leer_archivo, plantilla_csv, preparar_filas
+from indice_plantilla import IndicePlantilla
+from instantanea import InstantaneaDatos
+from metricas import METRICAS, Rerun
+from modelo_evaluaciones import (
+    COL_AREA, COL_NIVEL, COL_NOMBRE, COL_PERIODO, COLUMNAS_FIJAS, ENCABEZADOS_EVALUACION, FACTORES, PUNTAJE_MAXIMO,
+    TOOLTIPS, columnas_plantilla, columnas_puntajes, etiqueta_periodo, normalizar_incremental,
+)
+from planificador_sheets import PlanificadorSheets
+from recursos_sheets import RecursosSheets
+from reportes import generar_reportes
+from sheets_falso import ClienteFalso
+from tabla_paginada import mostrar_tabla_paginada
 
 # ===========================================================
 # CONFIGURACIÓN GENERAL
 # ===========================================================
 st.set_page_config(layout="wide", page_title="Sistema de Evaluación del Desempeño")
+rerun = Rerun()  # Tiempos por fase de esta ejecución del script
 # Ocultar íconos y enlaces de Streamlit/GitHub
 st.markdown("""
     <style>
@@ -26,415 +45,497 @@ st.markdown("""
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets",
           "https://www.googleapis.com/auth/drive"]
 
-# Credenciales desde Streamlit Secrets
-creds_dict = json.loads(st.secrets["general"]["gcp_service_account"])
-creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
-client = gspread.authorize(creds)
-
 # ID del archivo de Google Sheets
 SHEET_ID = "1L1hNefm59HtAnKwNci67B8nsiVdu7n63E9SZZlfoayo"
 
-# ===========================================================
-# CARGA DE DATOS CON CACHÉ
-# ===========================================================
-@st.cache_data(ttl=60)
-def cargar_datos():
-    """Carga todos los datos de la hoja, forzando rango completo A:AP."""
-    spreadsheet = client.open_by_key(SHEET_ID)
-    hoja = spreadsheet.worksheet("trabajadores")
-
-    # Forzar lectura completa (ajusta "AP" si agregas más columnas en el futuro)
-    rango = "A:AP"
-    datos = hoja.get(rango)
-    encabezados = datos[0]
-    filas = datos[1:]
-
-    # Rellenar filas cortas con celdas vacías
-    for fila in filas:
-        if len(fila) < len(encabezados):
-            fila += [""] * (len(encabezados) - len(fila))
-
-    df = pd.DataFrame(filas, columns=encabezados)
-    return df
-
-
-
-trabajadores = cargar_datos()
+# Motor de almacenamiento (Streamlit Secrets, sección [general]):
+#   almacenamiento = "sheets" (por defecto) | "sqlite" | "parquet" | "sheets_falso"
+#   ruta_almacenamiento = archivo SQLite, directorio Parquet o CSV inicial de sheets_falso (opcional)
+#   cuota_lectura_min / cuota_escritura_min = presupuesto por minuto hacia Sheets (0 = sin límite)
+MOTOR_ALMACENAMIENTO = st.secrets["general"].get("almacenamiento", "sheets")
+RUTA_ALMACENAMIENTO = st.secrets["general"].get("ruta_almacenamiento")
+CUOTA_LECTURA_MIN = int(st.secrets["general"].get("cuota_lectura_min", 60))
+CUOTA_ESCRITURA_MIN = int(st.secrets["general"].get("cuota_escritura_min", 60))
+
+@st.cache_resource
+def obtener_almacenamiento():
+    """Motor de almacenamiento único por proceso (cliente, pool HTTP y cachés incluidos)."""
+    recursos = None
+    # Compartido por todas las sesiones: una sola cuota, uniones de lecturas y reintentos
+    planificador = PlanificadorSheets(CUOTA_LECTURA_MIN, CUOTA_ESCRITURA_MIN)
+    if MOTOR_ALMACENAMIENTO == "sheets":
+        # Credenciales desde Streamlit Secrets
+        creds_dict = json.loads(st.secrets["general"]["gcp_service_account"])
+        creds = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+        recursos = RecursosSheets(creds, SHEET_ID, planificador=planificador)
+    elif MOTOR_ALMACENAMIENTO == "sheets_falso":
+        # Hoja en memoria con latencia y cuotas simuladas, sin red (opcionalmente precargada de un CSV)
+        latencias = {"latencia_lectura": 0.3, "latencia_escritura": 0.5}
+        if RUTA_ALMACENAMIENTO:
+            cliente = ClienteFalso.desde_csv(RUTA_ALMACENAMIENTO, **latencias)
+        else:
+            cliente = ClienteFalso({"trabajadores": [ENCABEZADOS_EVALUACION]}, **latencias)
+        recursos = RecursosSheets(None, SHEET_ID, client=cliente, planificador=planificador)
+    return crear_almacenamiento(MOTOR_ALMACENAMIENTO, RUTA_ALMACENAMIENTO, recursos)
 
-if trabajadores.empty:
-    st.error("⚠️ La hoja 'trabajadores' está vacía o sin encabezados.")
-    st.stop()
+almacenamiento = obtener_almacenamiento()
 
 # ===========================================================
-# INTERFAZ PRINCIPAL
+# CARGA DE DATOS POR MODO CON INSTANTÁNEA EN DISCO
 # ===========================================================
-st.title("💼 Sistema de Evaluación del Desempeño")
-modo = st.sidebar.radio("Selecciona el modo:", ("RH", "Administrador"))
-
+# Cada modo lee solo sus columnas y cada proyección tiene su propia caché:
+#   plantilla → columnas fijas del trabajador (RH e importación); cambia poco
+#   puntajes  → área, nombre, periodo, factores y puntaje (panel administrativo)
+PROYECCIONES = {
+    "plantilla": (columnas_plantilla, 600),   # (columnas, edad máxima en segundos)
+    "puntajes": (columnas_puntajes, 60),
+}
+PROYECCION_POR_MODO = {"RH": "plantilla", "Importación masiva": "plantilla", "Administrador": "puntajes"}
+
+@st.cache_resource
+def obtener_instantanea(proyeccion):
+    """Último frame tipado de la proyección, servido al instante y refrescado en segundo plano."""
+    columnas, max_edad_seg = PROYECCIONES[proyeccion]
+    return InstantaneaDatos(
+        f"instantanea_{MOTOR_ALMACENAMIENTO}_{proyeccion}.parquet",
+        lambda: almacenamiento.cargar(columnas), normalizar_incremental, max_edad_seg,
+    )
+
+@st.cache_resource
+def obtener_indice_plantilla():
+    """Índice área → nombres y nombre → registro para el modo RH."""
+    return IndicePlantilla()
+
+@st.cache_resource
+def obtener_cubo():
+    """Cubo de agregados del panel administrativo, compartido por todas las sesiones."""
+    return CuboEvaluaciones()
 
-# ===========================================================
-# 🔴 CONTROL DE COLA Y BLOQUEO (PARA BATCH APPEND)
-# ===========================================================
-buffer_evaluaciones = []       # Cola temporal de evaluaciones
-lock = Lock()                  # Control de exclusión mutua
-ULTIMA_ESCRITURA = 0           # Timestamp última escritura
-INTERVALO_SEG = 60             # Intervalo máximo (segundos)
-BATCH_SIZE = 10                # Enviar cada 10 evaluaciones
-
-# 🔴 Función para enviar lote completo a Google Sheets
-def enviar_lote_a_sheets():
-    global buffer_evaluaciones, ULTIMA_ESCRITURA
-    if not buffer_evaluaciones:
-        return
-    try:
-        hoja_live = client.open_by_key(SHEET_ID).worksheet("trabajadores")
-        hoja_live.spreadsheet.values_append(
-            "trabajadores",
-            params={"valueInputOption": "USER_ENTERED"},
-            body={"values": buffer_evaluaciones},
-        )
-        buffer_evaluaciones.clear()
-        ULTIMA_ESCRITURA = time.time()
-        st.toast("📤 Evaluaciones enviadas correctamente al servidor.")
-    except Exception as e:
-        st.error(f"⚠️ Error al enviar lote: {e}")
 
 # ===========================================================
-# MODO ADMINISTRADOR
+# INTERFAZ PRINCIPAL
 # ===========================================================
-if modo == "Administrador":
-    password = st.text_input("Contraseña de administrador:", type="password")
-    if password == "admin123":
-        st.subheader("📊 Panel Administrativo")
-        st.info("Visualiza y analiza el historial de evaluaciones registradas por área o trabajador.")
-
-        # -------------------------------------------------------
-        # Filtros por área y trabajador
-        # -------------------------------------------------------
-        area_sel = st.selectbox(
-            "Filtrar por área:",
-            ["Todos"] + sorted(trabajadores["Área de Adscripción:"].unique().tolist())
-        )
-
-        df_filtro = (
-            trabajadores
-            if area_sel == "Todos"
-            else trabajadores[trabajadores["Área de Adscripción:"] == area_sel]
-        )
-
-        trabajador_sel = st.selectbox(
-            "Filtrar por trabajador:",
-            ["Todos"] + sorted(df_filtro["Nombre(s) y Apellidos:"].unique().tolist())
-        )
-        if trabajador_sel != "Todos":
-            df_filtro = df_filtro[df_filtro["Nombre(s) y Apellidos:"] == trabajador_sel]
-
-        st.dataframe(df_filtro, use_container_width=True)
+# st.stop(), st.rerun() y cualquier excepción pasan por el finally: todo rerun queda registrado
+try:
+    st.title("💼 Sistema de Evaluación del Desempeño")
+    modo = st.sidebar.radio("Selecciona el modo:", ("RH", "Importación masiva", "Administrador"))
+    rerun.etiquetas["modo"] = modo
+
+    instantanea = obtener_instantanea(PROYECCION_POR_MODO[modo])
+    with rerun.fase("cargar_datos"):
+        METRICAS.contar("cargar_datos_llamadas_total")
+        trabajadores = instantanea.obtener()
+
+    edad_datos = instantanea.edad()
+    st.sidebar.caption(
+        f"🕒 Datos de hace {edad_datos:.0f} s" + (" · actualizando…" if instantanea.actualizando() else "")
+    )
+    if instantanea.ultimo_error:
+        st.sidebar.warning(f"No se pudieron refrescar los datos: {instantanea.ultimo_error}")
+
+    if trabajadores.empty:
+        st.error("⚠️ La hoja 'trabajadores' está vacía o sin encabezados.")
+        st.stop()
+
+
+    # ===========================================================
+    # 🔴 COLA DE ESCRITURA DIFERIDA (PARA BATCH APPEND)
+    # ===========================================================
+    RUTA_COLA = "cola_evaluaciones.db"   # Diario en disco (SQLite WAL)
+    INTERVALO_SEG = 60                   # Intervalo máximo (segundos)
+    BATCH_SIZE = 10                      # Enviar cada 10 evaluaciones
+
+    @st.cache_resource
+    def obtener_cola():
+        """Cola única por proceso: sobrevive a los reruns de Streamlit y envía lo pendiente al cerrar."""
+        cola = ColaEscritura(RUTA_COLA, almacenamiento.agregar_filas, tamano_lote=BATCH_SIZE, intervalo_seg=INTERVALO_SEG)
+        atexit.register(cola.detener)
+        return cola
+
+    cola_evaluaciones = obtener_cola()
+
+    pendientes = cola_evaluaciones.pendientes()
+    if pendientes:
+        st.sidebar.caption(f"📤 Evaluaciones pendientes de envío: {pendientes}")
+    if cola_evaluaciones.ultimo_envio:
+        st.sidebar.caption(f"Último envío a Sheets: {datetime.fromtimestamp(cola_evaluaciones.ultimo_envio):%H:%M:%S}")
+    if cola_evaluaciones.ultimo_error:
+        st.sidebar.warning(f"⚠️ Error al enviar lote (se reintentará): {cola_evaluaciones.ultimo_error}")
+    rechazadas = cola_evaluaciones.rechazadas()
+    if rechazadas:
+        st.sidebar.caption(f"❌ Evaluaciones rechazadas por Sheets: {len(rechazadas)} (ver panel de administrador)")
+
+    # ===========================================================
+    # PARÁMETROS DE GRÁFICAS
+    # ===========================================================
+    UMBRAL_FILAS_GRAFICA = 2000     # Combinaciones trabajador/periodo antes de agregar
+    UMBRAL_TRAZAS_GRAFICA = 20      # Trabajadores (trazas) antes de agregar
+    TOP_N_TRABAJADORES = 10         # Trabajadores visibles en modo agregado (+ "Otros")
+
+    # ===========================================================
+    # CAPTURA DE EVALUACIÓN (FORMULARIO DENTRO DE UN FRAGMENTO)
+    # ===========================================================
+    # Las metas, los 12 factores y los comentarios viven en un solo st.form: moverlos
+    # no provoca reruns. Al enviar, solo se vuelve a ejecutar este fragmento (no
+    # cargar_datos ni la búsqueda de trabajadores), que muestra la vista previa del
+    # puntaje y, si se pulsó "Guardar Evaluación", encola la fila.
+    @st.fragment
+    def capturar_evaluacion(trab):
+        metas_prog = {i: float(trab[f"Meta {i} prog"] or 0) for i in range(1, 4)}
+
+        with st.form("form_evaluacion"):
+            st.subheader("Metas Reales Cumplidas")
+            meta_real = {}
+            for i in range(1, 4):
+                desc = trab[f"Meta {i} descripción"] or "Sin descripción"
+                st.markdown(f"**Meta {i}:** {desc} (Programada: {metas_prog[i]})")
+                meta_real[f"meta{i}_real"] = st.number_input(f"Cumplimiento real de Meta {i}", min_value=0.0, value=0.0, step=0.1, key=f"meta{i}_real")
+
+            # -------------------------------------------------------
+            # FACTORES DE CALIDAD CON TOOLTIP
+            # -------------------------------------------------------
+            st.subheader("Factores de Calidad")
+            calidad = {}
+            for factor in FACTORES:
+                st.markdown(f"### {factor} {TOOLTIPS[factor]}", unsafe_allow_html=True)
+                calidad[factor] = st.slider("Selecciona nivel", 1, 4, 2, key=f"slider_{factor}")
+
+            # -------------------------------------------------------
+            # FECHA BLOQUEADA Y COMENTARIOS
+            # -------------------------------------------------------
+            st.subheader("Fecha y Comentarios")
+            hoy = datetime.now()
+            dia, mes, anio = hoy.day, hoy.month, hoy.year
+            st.text_input("Fecha de Evaluación", f"{dia}/{mes}/{anio}", disabled=True)
+            comentarios = st.text_area("Comentarios", key="comentarios_eval")
+
+            c1, c2 = st.columns(2)
+            vista_previa = c1.form_submit_button("👁️ Calcular puntaje")
+            guardar = c2.form_submit_button("Guardar Evaluación", type="primary")
 
         # -------------------------------------------------------
-        # Limpieza de columnas y filtrado de evaluaciones reales
+        # VISTA PREVIA DEL PUNTAJE
         # -------------------------------------------------------
-        df_filtro.columns = df_filtro.columns.str.strip()  # Elimina espacios y ":" finales
-
-        # Buscar columnas clave con tolerancia de nombres
-        col_puntaje = next((c for c in df_filtro.columns if "Puntaje" in c), None)
-        col_mes = next((c for c in df_filtro.columns if "Mes" in c), None)
-        col_anio = next((c for c in df_filtro.columns if "Año" in c or "Anio" in c), None)
-
-        if col_puntaje and col_mes and col_anio:
-            df_filtro_eval = df_filtro[df_filtro[col_puntaje].astype(str).str.strip() != ""]
-            df_filtro_eval = df_filtro_eval[df_filtro_eval[col_mes].astype(str).str.strip() != ""]
-
-            if not df_filtro_eval.empty:
-                # Conversión a valores numéricos
-                df_filtro_eval[col_puntaje] = pd.to_numeric(df_filtro_eval[col_puntaje], errors="coerce")
-                df_filtro_eval[col_mes] = pd.to_numeric(df_filtro_eval[col_mes], errors="coerce")
-                df_filtro_eval[col_anio] = pd.to_numeric(df_filtro_eval[col_anio], errors="coerce")
-
-                # Crear columna "Periodo" tipo Mes/Año
-                df_filtro_eval["Periodo"] = df_filtro_eval.apply(
-                    lambda x: f"{int(x[col_mes])}/{int(x[col_anio])}"
-                    if pd.notnull(x[col_mes]) and pd.notnull(x[col_anio])
-                    else "",
-                    axis=1
+        resultados = {
+            f"resultado{i}": round(meta_real[f"meta{i}_real"] / metas_prog[i] * 100, 2) if metas_prog[i] else 0
+            for i in range(1, 4)
+        }
+        puntaje_total = sum(calidad.values())
+        if vista_previa or guardar:
+            for i in range(1, 4):
+                st.write(f"Resultado Meta {i}: {resultados[f'resultado{i}']}%")
+            st.write(f"**Puntaje total:** {puntaje_total}/{PUNTAJE_MAXIMO}")
+
+        # ===========================================================
+        # GUARDAR EVALUACIÓN (versión con batch y sincronización)
+        # ===========================================================
+        if guardar:
+            nueva_fila = [
+                trab[c] for c in COLUMNAS_FIJAS
+            ] + [
+                dia, mes, anio,
+                meta_real["meta1_real"], meta_real["meta2_real"], meta_real["meta3_real"],
+                resultados["resultado1"], resultados["resultado2"], resultados["resultado3"],
+            ] + [
+                calidad[factor] for factor in FACTORES
+            ] + [
+                puntaje_total, comentarios
+            ]
+
+            nueva_fila = [str(x) for x in nueva_fila]
+
+            # 🔴 NUEVO: se guarda en el diario local y el hilo de la cola lo envía en bloque
+            fragmento = Rerun()
+            fragmento.etiquetas["modo"] = "RH (fragmento)"
+            with fragmento.fase("guardar"):
+                cola_evaluaciones.encolar(nueva_fila)
+            fragmento.finalizar()
+
+            # 🔴 Confirmación inmediata
+            st.success(f"✅ Evaluación registrada localmente para {trab['Nombre(s) y Apellidos:']} el {dia}/{mes}/{anio}.")
+            st.info("La información se enviará automáticamente al servidor en los próximos segundos o al acumular varias evaluaciones.")
+
+    # ===========================================================
+    # MODO ADMINISTRADOR
+    # ===========================================================
+    if modo == "Administrador":
+        password = st.text_input("Contraseña de administrador:", type="password")
+        if password == "admin123":
+            st.subheader("📊 Panel Administrativo")
+            st.info("Visualiza y analiza el historial de evaluaciones registradas por área o trabajador.")
+
+            # -------------------------------------------------------
+            # Filtros por área y trabajador (opciones desde el cubo)
+            # -------------------------------------------------------
+            cubo = obtener_cubo()
+            with rerun.fase("cubo"):
+                cubo.sincronizar(trabajadores)
+
+            area_sel = st.selectbox("Filtrar por área:", [TODOS] + cubo.areas())
+            trabajador_sel = st.selectbox("Filtrar por trabajador:", [TODOS] + cubo.nombres(area_sel))
+
+            columnas = trabajadores.attrs["columnas"]
+            with rerun.fase("filtrado"):
+                df_filtro = trabajadores
+                if area_sel != TODOS:
+                    df_filtro = df_filtro[df_filtro[COL_AREA] == area_sel]
+                if trabajador_sel != TODOS:
+                    df_filtro = df_filtro[df_filtro[COL_NOMBRE] == trabajador_sel]
+
+            with rerun.fase("tabla"):
+                mostrar_tabla_paginada(
+                    df_filtro,
+                    [COL_NOMBRE, COL_AREA, "Puesto que desempeña:", COL_NIVEL, COL_PERIODO, columnas["puntaje"]],
+                    clave="tabla_admin"
                 )
 
-                # Calcular promedio general
-                if df_filtro_eval[col_puntaje].notnull().any():
-                    promedio_general = round(df_filtro_eval[col_puntaje].mean(), 2)
-                    total_evals = len(df_filtro_eval)
+            # -------------------------------------------------------
+            # Indicadores y gráficas desde el cubo de agregados
+            # -------------------------------------------------------
+            if columnas["puntaje"] and columnas["mes"] and columnas["anio"]:
+                resumen = cubo.resumen(area_sel, trabajador_sel)
+
+                if resumen is not None:
+                    # Calcular promedio general
+                    promedio_general = round(resumen.media, 2)
                     st.markdown(
-                        f"### 📈 Promedio general: **{promedio_general}/24** &nbsp;&nbsp; _(Evaluaciones registradas: {total_evals})_"
+                        f"### 📈 Promedio general: **{promedio_general}/{PUNTAJE_MAXIMO}** &nbsp;&nbsp; _(Evaluaciones registradas: {resumen.n})_"
                     )
-                else:
-                    st.info("⚠️ No hay datos numéricos válidos en 'Puntaje total'.")
-
-                # -------------------------------------------------------
-                # GRÁFICAS
-                # -------------------------------------------------------
-                col1, col2 = st.columns(2)
-
-                # 🔹 Gráfica izquierda: evolución temporal (por evaluación)
-                with col1:
-                    if "Periodo" in df_filtro_eval.columns and col_puntaje in df_filtro_eval.columns:
-                        fig1 = px.bar(
-                            df_filtro_eval,
-                            x="Periodo",
-                            y=col_puntaje,
-                            color="Nombre(s) y Apellidos:",
-                            barmode="group",
-                            title="Evolución del Puntaje por Evaluación (Mes/Año)",
-                            text=col_puntaje
+                    with st.expander("Promedio por factor de calidad"):
+                        st.dataframe(
+                            pd.Series(resumen.promedio_factores(), name="Promedio").round(2),
+                            use_container_width=True
                         )
-                        fig1.update_layout(
-                            xaxis_title="Periodo (Mes/Año)",
-                            yaxis_title="Puntaje total",
-                            legend_title="Trabajador",
-                            bargap=0.25
-                        )
-                        fig1.update_traces(texttemplate='%{text:.1f}', textposition='outside')
-                        st.plotly_chart(fig1, use_container_width=True)
-                    else:
-                        st.warning("⚠️ No se encontraron columnas 'Mes', 'Año' o 'Puntaje total' para generar la gráfica temporal.")
-
-                # 🔹 Gráfica derecha: distribución por área
-                with col2:
-                    fig2 = px.box(
-                        df_filtro_eval,
-                        x="Área de Adscripción:",
-                        y=col_puntaje,
-                        title="Distribución del Puntaje por Área"
-                    )
-                    st.plotly_chart(fig2, use_container_width=True)
-
-            else:
-                st.warning("⚠️ No hay evaluaciones registradas en esta área o trabajador.")
-        else:
-            st.error("❌ No se encontraron columnas de 'Mes', 'Año' o 'Puntaje total' en la hoja.")
-    elif password != "":
-        st.error("❌ Contraseña incorrecta.")
-
-
-# ===========================================================
-# MODO RH
-# ===========================================================
-elif modo == "RH":
-    st.subheader("🧾 Modo Recursos Humanos: Evaluación del Desempeño")
-
-    # Trabajadores únicos
-    trabajadores_unicos = trabajadores.drop_duplicates(subset=["Nombre(s) y Apellidos:"])
-
-    # Filtros
-    area_sel = st.selectbox("Filtrar por área:", sorted(trabajadores_unicos["Área de Adscripción:"].unique().tolist()))
-    lista_nombres = trabajadores_unicos[trabajadores_unicos["Área de Adscripción:"] == area_sel]["Nombre(s) y Apellidos:"].tolist()
-    seleccionado = st.selectbox("Selecciona un trabajador:", lista_nombres)
-    trab = trabajadores_unicos[trabajadores_unicos["Nombre(s) y Apellidos:"] == seleccionado].iloc[0]
-
-    # -------------------------------------------------------
-    # DATOS PERSONALES
-    # -------------------------------------------------------
-    st.subheader("Datos Personales")
-    cols = st.columns(2)
-    campos = [
-        "Nombre(s) y Apellidos:", "C.U.R.P.", "R.F.C.", "Superior Jerárquico:", "Área de Adscripción:",
-        "Puesto que desempeña:", "Nivel:", "Fecha del Nombramiento:", "Antigüedad en el Puesto:", "Antigüedad en Gobierno:"
-    ]
-    etiquetas = [
-        "Nombre", "CURP", "RFC", "Superior", "Área", "Puesto", "Nivel",
-        "Fecha de Nombramiento", "Antigüedad en Puesto", "Antigüedad en Gobierno"
-    ]
-    for i, campo in enumerate(campos):
-        cols[i % 2].text_input(etiquetas[i], trab[campo], disabled=True)
-
-    # -------------------------------------------------------
-    # FUNCIONES Y METAS
-    # -------------------------------------------------------
-    st.subheader("Actividades Principales")
-    for i in range(1, 4):
-        st.text_input(f"Actividad {i}", trab[f"Principal Funcion {i}"], disabled=True)
-
-    st.subheader("Metas Reales Cumplidas")
-    meta_real, resultados = {}, {}
-    for i in range(1, 4):
-        desc = trab[f"Meta {i} descripción"] or "Sin descripción"
-        prog = float(trab[f"Meta {i} prog"] or 0)
-        st.markdown(f"**Meta {i}:** {desc} (Programada: {prog})")
-        meta_real[f"meta{i}_real"] = st.number_input(f"Cumplimiento real de Meta {i}", min_value=0.0, value=0.0, step=0.1, key=f"meta{i}_real")
-        resultados[f"resultado{i}"] = round(meta_real[f"meta{i}_real"] / prog * 100, 2) if prog else 0
-        st.write(f"Resultado: {resultados[f'resultado{i}']}%")
-
-    # -------------------------------------------------------
-    # FACTORES DE CALIDAD CON TOOLTIP
-    # -------------------------------------------------------
-    st.subheader("Factores de Calidad")
-
-    descripciones = {
-        "CONOCIMIENTO DEL PUESTO": [
-            "1️⃣ Posee mínimos conocimientos del puesto que tiene asignado, lo que le impide cumplir con la oportunidad y calidad establecidas.",
-            "2️⃣ Posee conocimientos elementales del puesto, lo que provoca deficiencias en la oportunidad y calidad básicas establecidas.",
-            "3️⃣ Posee un regular conocimiento del puesto, lo que le permite prestar servicios con oportunidad y calidad básicas.",
-            "4️⃣ Posee amplios conocimientos del puesto que tiene asignado, lo que le permite prestar los servicios con oportunidad y calidad requeridas."
-        ],
-        "CRITERIO": [
-            "1️⃣ Propone soluciones irrelevantes a los problemas de trabajo que se le presentan.",
-            "2️⃣ Propone soluciones aceptables a los problemas de trabajo que se le presentan.",
-            "3️⃣ Propone soluciones adecuadas a los problemas de trabajo que se le presentan.",
-            "4️⃣ Propone soluciones óptimas a los problemas de trabajo que se le presentan."
-        ],
-        "CALIDAD DEL TRABAJO": [
-            "1️⃣ Realiza trabajos con alto índice de errores en su confiabilidad, exactitud y presentación.",
-            "2️⃣ Realiza trabajos regulares con algunos errores.",
-            "3️⃣ Realiza buenos trabajos y excepcionalmente comete errores.",
-            "4️⃣ Realiza trabajos excelentes sin errores en su confiabilidad, exactitud y presentación."
-        ],
-        "TÉCNICA Y ORGANIZACIÓN DEL TRABAJO": [
-            "1️⃣ Aplica en grado mínimo las técnicas y organización establecidas.",
-            "2️⃣ Aplica ocasionalmente las técnicas establecidas.",
-            "3️⃣ Aplica la mayoría de las veces las técnicas establecidas.",
-            "4️⃣ Aplica en grado óptimo las técnicas y organización establecidas."
-        ],
-        "NECESIDAD DE SUPERVISIÓN": [
-            "1️⃣ Requiere permanente supervisión para realizar las funciones asignadas.",
-            "2️⃣ Requiere ocasional supervisión para realizar las funciones asignadas.",
-            "3️⃣ Requiere mínima supervisión para realizar las funciones asignadas.",
-            "4️⃣ Requiere nula supervisión para realizar las funciones asignadas."
-        ],
-        "CAPACITACIÓN RECIBIDA": [
-            "1️⃣ Aplica mínimamente los conocimientos adquiridos mediante la capacitación.",
-            "2️⃣ Aplica limitadamente los conocimientos adquiridos.",
-            "3️⃣ Aplica suficientemente los conocimientos adquiridos, elevando la eficiencia.",
-            "4️⃣ Aplica ampliamente los conocimientos adquiridos, elevando la eficiencia al máximo."
-        ],
-        "INICIATIVA": [
-            "1️⃣ Realiza nulas aportaciones para el mejoramiento del trabajo.",
-            "2️⃣ Realiza aportaciones irrelevantes para el mejoramiento.",
-            "3️⃣ Realiza aportaciones destacadas que mejoran calidad y tiempos.",
-            "4️⃣ Realiza aportaciones óptimas y continuas para el mejoramiento."
-        ],
-        "COLABORACIÓN Y DISCRECIÓN": [
-            "1️⃣ Muestra nula disposición para colaborar y provoca conflictos.",
-            "2️⃣ Muestra regular disposición y comete indiscreciones involuntarias.",
-            "3️⃣ Muestra buena disposición y prudencia en el manejo de información.",
-            "4️⃣ Muestra notable disposición y utiliza positivamente la información."
-        ],
-        "RESPONSABILIDAD Y DISCIPLINA": [
-            "1️⃣ Cumple mínimamente con las metas y evade disposiciones.",
-            "2️⃣ Cumple ocasionalmente con las metas y objeta disposiciones.",
-            "3️⃣ Cumple la mayoría de las veces con las metas y disposiciones.",
-            "4️⃣ Cumple invariablemente con metas institucionales y disposiciones."
-        ],
-        "TRABAJO EN EQUIPO": [
-            "1️⃣ Manifiesta nula disposición y entorpece el trabajo del equipo.",
-            "2️⃣ Manifiesta regular disposición y ocasionalmente interfiere.",
-            "3️⃣ Manifiesta buena disposición, contribuyendo al equipo.",
-            "4️⃣ Manifiesta notable disposición, siendo un elemento clave del equipo."
-        ],
-        "RELACIONES INTERPERSONALES": [
-            "1️⃣ Mantiene nulo grado de interacción con jefes, compañeros y público.",
-            "2️⃣ Mantiene regular grado de interacción con jefes, compañeros y público.",
-            "3️⃣ Mantiene buen grado de interacción con jefes, compañeros y público.",
-            "4️⃣ Mantiene excelente grado de interacción con jefes, compañeros y público."
-        ],
-        "MEJORA CONTINUA": [
-            "1️⃣ Demuestra mínimo compromiso para identificar áreas de oportunidad.",
-            "2️⃣ Demuestra regular compromiso para proponer mejoras.",
-            "3️⃣ Demuestra alto compromiso para identificar y proponer mejoras.",
-            "4️⃣ Demuestra amplio compromiso para mejorar continuamente su desempeño."
-        ]
-    }
-
-
-    st.markdown("""
-        <style>
-        .tooltip { position: relative; display: inline-block; cursor: help; color: #2c7be5; font-weight: bold; }
-        .tooltip .tooltiptext {
-            visibility: hidden; width: 420px; background-color: #f8f9fa; color: #000; text-align: left;
-            border-radius: 8px; padding: 10px; position: absolute; z-index: 1;
-            top: 125%; left: 50%; transform: translateX(-50%);
-            box-shadow: 0px 0px 10px rgba(0,0,0,0.2); font-size: 13px; line-height: 1.4;
-        }
-        .tooltip:hover .tooltiptext { visibility: visible; }
-        </style>
-    """, unsafe_allow_html=True)
-
-    calidad = {}
-    for factor, niveles in descripciones.items():
-        tooltip_html = f"<div class='tooltip'>ⓘ<div class='tooltiptext'><b>{factor}</b><br><br>{'<br>'.join(niveles)}</div></div>"
-        st.markdown(f"### {factor} {tooltip_html}", unsafe_allow_html=True)
-        calidad[factor] = st.slider("Selecciona nivel", 1, 4, 2, key=f"slider_{factor}")
-
-        puntaje_total = sum(calidad.values())
-    st.write(f"**Puntaje total:** {puntaje_total}/48")  # ✅ 12 factores = 48 puntos posibles
-
-    # -------------------------------------------------------
-    # FECHA BLOQUEADA Y COMENTARIOS
-    # -------------------------------------------------------
-    st.subheader("Fecha y Comentarios")
-    hoy = datetime.now()
-    dia, mes, anio = hoy.day, hoy.month, hoy.year
-    st.text_input("Fecha de Evaluación", f"{dia}/{mes}/{anio}", disabled=True)
-    comentarios = st.text_area("Comentarios", key="comentarios_eval")
-
-# ===========================================================
-# GUARDAR EVALUACIÓN (versión con batch y sincronización)
-# ===========================================================
-if st.button("Guardar Evaluación"):
-    hoja_live = client.open_by_key(SHEET_ID).worksheet("trabajadores")
-
-    columnas_fijas = [
-        "Nombre(s) y Apellidos:", "C.U.R.P.", "R.F.C.", "Superior Jerárquico:", "Área de Adscripción:",
-        "Puesto que desempeña:", "Nivel:", "Fecha del Nombramiento:", "Antigüedad en el Puesto:",
-        "Antigüedad en Gobierno:", "Principal Funcion 1", "Principal Funcion 2", "Principal Funcion 3",
-        "Meta 1 descripción", "Meta 2 descripción", "Meta 3 descripción", "Meta 1 prog", "Meta 2 prog", "Meta 3 prog"
-    ]
-
-    nueva_fila = [
-        trab[c] for c in columnas_fijas
-    ] + [
-        dia, mes, anio,
-        meta_real["meta1_real"], meta_real["meta2_real"], meta_real["meta3_real"],
-        resultados["resultado1"], resultados["resultado2"], resultados["resultado3"],
-        calidad["CONOCIMIENTO DEL PUESTO"], calidad["CRITERIO"], calidad["CALIDAD DEL TRABAJO"],
-        calidad["TÉCNICA Y ORGANIZACIÓN DEL TRABAJO"], calidad["NECESIDAD DE SUPERVISIÓN"],
-        calidad["CAPACITACIÓN RECIBIDA"], calidad["INICIATIVA"], calidad["COLABORACIÓN Y DISCRECIÓN"],
-        calidad["RESPONSABILIDAD Y DISCIPLINA"], calidad["TRABAJO EN EQUIPO"],
-        calidad["RELACIONES INTERPERSONALES"], calidad["MEJORA CONTINUA"],
-        puntaje_total, comentarios
-    ]
-
-    nueva_fila = [str(x) for x in nueva_fila]
-
-    encabezados = hoja_live.row_values(1)
-    num_columnas = len(encabezados)
-
-    if len(nueva_fila) < num_columnas:
-        nueva_fila += [""] * (num_columnas - len(nueva_fila))
-    elif len(nueva_fila) > num_columnas:
-        nueva_fila = nueva_fila[:num_columnas]
-
-    # 🔴 NUEVO: se guarda en cola y se envía en bloque
-    with lock:
-        buffer_evaluaciones.append(nueva_fila)
-        if len(buffer_evaluaciones) >= BATCH_SIZE or (time.time() - ULTIMA_ESCRITURA > INTERVALO_SEG):
-            enviar_lote_a_sheets()
-
-    # 🔴 Confirmación inmediata
-    st.success(f"✅ Evaluación registrada localmente para {trab['Nombre(s) y Apellidos:']} el {dia}/{mes}/{anio}.")
-    st.info("La información se enviará automáticamente al servidor en los próximos segundos o al acumular varias evaluaciones.")
-
-
-
-
-
-
 
+                    # -------------------------------------------------------
+                    # GRÁFICAS
+                    # -------------------------------------------------------
+                    col1, col2 = st.columns(2)
+
+                    # 🔹 Gráfica izquierda: evolución temporal (promedio por trabajador y periodo)
+                    with col1, rerun.fase("grafica_evolucion"):
+                        serie = cubo.serie(area_sel, trabajador_sel)
+                        if es_volumen_grande(serie, UMBRAL_FILAS_GRAFICA, UMBRAL_TRAZAS_GRAFICA):
+                            # Modo grandes volúmenes: agregación en servidor + trazas WebGL
+                            agrupar_por = st.radio(
+                                "Agrupar gráfica por:",
+                                (f"Top {TOP_N_TRABAJADORES} trabajadores", "Área"),
+                                index=1 if area_sel == TODOS else 0,
+                                horizontal=True
+                            )
+                            if agrupar_por == "Área":
+                                agrupada = agrupar_serie(serie, COL_AREA)
+                                fig1 = figura_evolucion_gl(agrupada, "Área")
+                            else:
+                                agrupada = agrupar_serie(serie, COL_NOMBRE, top_n=TOP_N_TRABAJADORES)
+                                fig1 = figura_evolucion_gl(agrupada, "Trabajador")
+                            st.caption(f"Vista agregada: {len(serie)} combinaciones trabajador/periodo.")
+                        else:
+                            serie = serie.assign(Periodo=etiqueta_periodo(serie[COL_PERIODO]))
+                            fig1 = px.bar(
+                                serie,
+                                x="Periodo",
+                                y="Promedio",
+                                color=COL_NOMBRE,
+                                barmode="group",
+                                title="Evolución del Puntaje por Evaluación (Mes/Año)",
+                                text="Promedio",
+                                hover_data=["Evaluaciones"]
+                            )
+                            fig1.update_layout(
+                                xaxis_title="Periodo (Mes/Año)",
+                                yaxis_title="Puntaje total",
+                                legend_title="Trabajador",
+                                bargap=0.25
+                            )
+                            fig1.update_traces(texttemplate='%{text:.1f}', textposition='outside')
+                        st.plotly_chart(fig1, use_container_width=True)
 
+                    # 🔹 Gráfica derecha: distribución por área (cajas precalculadas)
+                    with col2, rerun.fase("grafica_cajas"):
+                        st.plotly_chart(figura_cajas(cubo.cajas(area_sel, trabajador_sel)), use_container_width=True)
 
+                else:
+                    st.warning("⚠️ No hay evaluaciones registradas en esta área o trabajador.")
+            else:
+                st.error("❌ No se encontraron columnas de 'Mes', 'Año' o 'Puntaje total' en la hoja.")
+
+            # -------------------------------------------------------
+            # EVALUACIONES RECHAZADAS POR SHEETS
+            # -------------------------------------------------------
+            if rechazadas:
+                with st.expander(f"❌ Evaluaciones rechazadas por Sheets ({len(rechazadas)})"):
+                    for fila, error in rechazadas:
+                        st.caption(f"{fila[0]} — {error}")
+                    if st.button("Reintentar rechazadas"):
+                        cola_evaluaciones.reintentar_rechazadas()
+                        st.rerun()
+
+            # -------------------------------------------------------
+            # REPORTES POR LOTE (un HTML por trabajador y por área)
+            # -------------------------------------------------------
+            with st.expander("📦 Reportes por lote"):
+                st.caption(
+                    "Genera un reporte por trabajador y un resumen por área con las filas del filtro actual "
+                    "y los descarga en un ZIP. Los HTML se pueden imprimir a PDF desde el navegador."
+                )
+                if st.button(f"Generar reportes ({df_filtro[COL_NOMBRE].nunique()} trabajadores)"):
+                    barra = st.progress(0.0, text="Generando reportes...")
+                    destino = io.BytesIO()
+                    with rerun.fase("reportes"):
+                        total = generar_reportes(
+                            df_filtro, destino,
+                            al_avanzar=lambda hechos, total: barra.progress(hechos / total, text=f"{hechos}/{total} reportes"),
+                        )
+                    st.session_state["reportes_zip"] = destino.getvalue()
+                    barra.progress(1.0, text=f"✅ {total} reportes generados")
+                if "reportes_zip" in st.session_state:
+                    st.download_button(
+                        "Descargar reportes (ZIP)", st.session_state["reportes_zip"],
+                        file_name=f"reportes_evaluacion_{datetime.now():%Y%m%d}.zip", mime="application/zip",
+                    )
 
+            # -------------------------------------------------------
+            # MÉTRICAS DE RENDIMIENTO
+            # -------------------------------------------------------
+            with st.expander("⏱️ Métricas de rendimiento"):
+                c1, c2, c3, c4, c5 = st.columns(5)
+                c1.metric("cargar_datos: llamadas", METRICAS.valor("cargar_datos_llamadas_total"))
+                c2.metric("Aciertos de caché", METRICAS.valor("instantanea_lecturas_total", resultado="fresca"))
+                c3.metric("Servidas vencidas", METRICAS.valor("instantanea_lecturas_total", resultado="vencida"))
+                c4.metric("Fallos de caché", METRICAS.valor("instantanea_lecturas_total", resultado="sincrona"))
+                c5.metric("Refrescos en fondo", METRICAS.valor("instantanea_refrescos_total", resultado="ok"))
+
+                st.markdown("**Tiempo por fase del rerun**")
+                st.dataframe(METRICAS.resumen_histogramas("fase_segundos", "fase"), use_container_width=True, hide_index=True)
+                st.markdown("**Llamadas a la API de Google Sheets**")
+                st.dataframe(METRICAS.resumen_histogramas("sheets_latencia_segundos", "metodo"), use_container_width=True, hide_index=True)
+
+                st.download_button(
+                    "Descargar métricas (formato Prometheus)",
+                    METRICAS.exportar_prometheus(),
+                    file_name="metricas.prom",
+                    mime="text/plain"
+                )
+        elif password != "":
+            st.error("❌ Contraseña incorrecta.")
 
 
+    # ===========================================================
+    # MODO RH
+    # ===========================================================
+    elif modo == "RH":
+        st.subheader("🧾 Modo Recursos Humanos: Evaluación del Desempeño")
 
+        # Trabajadores únicos (índice construido una vez por refresco de datos)
+        indice = obtener_indice_plantilla()
+        with rerun.fase("indice_plantilla"):
+            indice.sincronizar(trabajadores)
 
+        # Filtros
+        area_sel = st.selectbox("Filtrar por área:", indice.areas())
+        seleccionado = st.selectbox("Selecciona un trabajador:", indice.nombres(area_sel))
+        trab = indice.registro(seleccionado)
 
+        # -------------------------------------------------------
+        # DATOS PERSONALES
+        # -------------------------------------------------------
+        st.subheader("Datos Personales")
+        cols = st.columns(2)
+        campos = [
+            "Nombre(s) y Apellidos:", "C.U.R.P.", "R.F.C.", "Superior Jerárquico:", "Área de Adscripción:",
+            "Puesto que desempeña:", "Nivel:", "Fecha del Nombramiento:", "Antigüedad en el Puesto:", "Antigüedad en Gobierno:"
+        ]
+        etiquetas = [
+            "Nombre", "CURP", "RFC", "Superior", "Área", "Puesto", "Nivel",
+            "Fecha de Nombramiento", "Antigüedad en Puesto", "Antigüedad en Gobierno"
+        ]
+        for i, campo in enumerate(campos):
+            cols[i % 2].text_input(etiquetas[i], trab[campo], disabled=True)
 
+        # -------------------------------------------------------
+        # FUNCIONES Y METAS
+        # -------------------------------------------------------
+        st.subheader("Actividades Principales")
+        for i in range(1, 4):
+            st.text_input(f"Actividad {i}", trab[f"Principal Funcion {i}"], disabled=True)
+
+        st.markdown("""
+            <style>
+            .tooltip { position: relative; display: inline-block; cursor: help; color: #2c7be5; font-weight: bold; }
+            .tooltip .tooltiptext {
+                visibility: hidden; width: 420px; background-color: #f8f9fa; color: #000; text-align: left;
+                border-radius: 8px; padding: 10px; position: absolute; z-index: 1;
+                top: 125%; left: 50%; transform: translateX(-50%);
+                box-shadow: 0px 0px 10px rgba(0,0,0,0.2); font-size: 13px; line-height: 1.4;
+            }
+            .tooltip:hover .tooltiptext { visibility: visible; }
+            </style>
+        """, unsafe_allow_html=True)
+
+        capturar_evaluacion(trab)
+
+    # ===========================================================
+    # MODO IMPORTACIÓN MASIVA
+    # ===========================================================
+    elif modo == "Importación masiva":
+        st.subheader("📥 Importación masiva de evaluaciones")
+        st.caption(
+            "Sube un CSV o XLSX con la CURP (o el nombre) del trabajador, las metas reales y el nivel (1-4) "
+            "de los 12 factores. Los datos personales y metas programadas se toman de la plantilla."
+        )
+        st.download_button("Descargar plantilla CSV", plantilla_csv(), "plantilla_importacion.csv", "text/csv")
+
+        indice = obtener_indice_plantilla()
+        with rerun.fase("indice_plantilla"):
+            indice.sincronizar(trabajadores)
+
+        archivo = st.file_uploader("Archivo de evaluaciones", type=["csv", "xlsx"])
+        if archivo is not None:
+            try:
+                with rerun.fase("importacion_validar"):
+                    filas, rechazos = preparar_filas(leer_archivo(archivo), indice)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                st.stop()
+
+            st.write(f"**Evaluaciones válidas:** {len(filas)} &nbsp;&nbsp; **Rechazadas:** {len(rechazos)}")
+            if len(rechazos):
+                with st.expander("Filas rechazadas"):
+                    st.dataframe(rechazos, hide_index=True)
+
+            # Avance por archivo (huella del contenido): reanudar sin repetir los bloques confirmados
+            avance = st.session_state.setdefault("importaciones", {})
+            huella = hashlib.sha256(archivo.getvalue()).hexdigest()
+            previas = avance.get(huella, 0)
+            error = st.session_state.pop("importacion_error", None)
+            if error:
+                st.error(f"❌ La importación se detuvo con {previas} de {len(filas)} evaluaciones escritas: {error}")
+                st.caption(
+                    "El bloque que falló pudo haberse escrito en la hoja antes del error; al reanudar se envía de "
+                    "nuevo, así que revisa si quedaron evaluaciones duplicadas."
+                )
 
+            if filas and previas >= len(filas):
+                st.info(f"Este archivo ya se importó ({previas} evaluaciones); no se vuelve a escribir.")
+            elif filas:
+                etiqueta = (f"Reanudar desde la evaluación {previas + 1} (faltan {len(filas) - previas})"
+                            if previas else f"Importar {len(filas)} evaluaciones")
+                if st.button(etiqueta, type="primary"):
+                    barra = st.progress(previas / len(filas), text="Escribiendo evaluaciones...")
+
+                    def al_avanzar(hechas, total):
+                        avance[huella] = hechas
+                        barra.progress(hechas / total, text=f"{hechas}/{total} escritas")
+
+                    try:
+                        with rerun.fase("importacion_escribir"):
+                            escribir_por_bloques(almacenamiento.agregar_filas, filas, al_avanzar=al_avanzar, desde=previas)
+                    except Exception as e:
+                        st.session_state["importacion_error"] = str(e)
+                        st.rerun()
+                    for proyeccion in PROYECCIONES:  # La siguiente lectura refresca en segundo plano
+                        obtener_instantanea(proyeccion).invalidar()
+                    st.success(f"✅ Se importaron {len(filas) - previas} evaluaciones.")
+finally:
+    rerun.finalizar()
@@ -0,0 +1,233 @@
+"""Benchmark sin navegador de la aplicación a escala sintética.
+
+Ejecuta ``app_evaluacion_desempeno.py`` con ``streamlit.testing.v1.AppTest``
+contra ``sheets_falso.ClienteFalso`` (sin red ni latencia simulada) y mide,
+para cada tamaño de hoja, la latencia de cada acción de usuario, la memoria
+pico de la carga inicial y las llamadas a la API de Sheets por acción. Al
+final simula un reinicio para medir el arranque desde la instantánea en disco.
+
+Uso (desde la raíz del repositorio):
+
+    python benchmarks/bench_app.py --filas 1000 10000 100000 --salida resultados.json
+    python benchmarks/bench_app.py --filas 10000 --comparar resultados.json
+
+Nota: AppTest vuelve a ejecutar el script completo en cada acción, incluso
+cuando en el navegador solo se ejecutaría un fragmento, así que las latencias
+del formulario RH son una cota superior.
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import gspread  # noqa: E402
+import pandas as pd  # noqa: E402
+import streamlit as st  # noqa: E402
+from google.oauth2 import service_account  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from datos_sinteticos import generar_hoja  # noqa: E402
+from sheets_falso import ClienteFalso  # noqa: E402
+
+APP = os.path.join(RAIZ, "app_evaluacion_desempeno.py")
+CONTRASENA_ADMIN = "admin123"
+
+
+# ===========================================================
+# UTILIDADES
+# ===========================================================
+def _boton(at, etiqueta):
+    return next(b for b in at.button if b.label.startswith(etiqueta))
+
+
+def _selectbox(at, etiqueta):
+    return next(s for s in at.selectbox if s.label == etiqueta)
+
+
+def _otra_opcion(widget):
+    """Una opción distinta de la actual (para forzar un cambio real)."""
+    opciones = [o for o in widget.options if o != widget.value]
+    return opciones[len(opciones) // 2] if opciones else widget.value
+
+
+class Medidor:
+    """Ejecuta acciones sobre la app y registra latencia y llamadas a la API."""
+
+    def __init__(self, at, cliente):
+        self.at = at
+        self.cliente = cliente
+        self.resultados = {}
+
+    def medir(self, nombre, accion, repeticiones):
+        tiempos, llamadas = [], Counter()
+        for _ in range(repeticiones):
+            antes = Counter(self.cliente.llamadas)
+            inicio = time.perf_counter()
+            accion()
+            tiempos.append(time.perf_counter() - inicio)
+            llamadas += Counter(self.cliente.llamadas) - antes
+            if self.at.exception:
+                raise RuntimeError(f"La acción '{nombre}' falló: {self.at.exception[0].message}")
+        self.resultados[nombre] = {
+            "latencia_ms": {
+                "mediana": round(statistics.median(tiempos) * 1000, 2),
+                "min": round(min(tiempos) * 1000, 2),
+                "max": round(max(tiempos) * 1000, 2),
+            },
+            "llamadas_api_por_accion": {k: v / repeticiones for k, v in sorted(llamadas.items())},
+        }
+
+
+# ===========================================================
+# ESCENARIO
+# ===========================================================
+def _nueva_app():
+    at = AppTest.from_file(APP, default_timeout=600)
+    at.secrets["general"] = {
+        "gcp_service_account": "{}", "almacenamiento": "sheets",
+        "cuota_lectura_min": 0, "cuota_escritura_min": 0,
+    }
+    return at
+
+
+def ejecutar_escala(num_filas, repeticiones):
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    for ruta in glob.glob("instantanea_*.parquet"):
+        os.remove(ruta)  # Sin instantánea de la escala anterior: la carga inicial es en frío
+    cliente = ClienteFalso({"trabajadores": generar_hoja(num_filas)}, cuota_lectura_min=0, cuota_escritura_min=0)
+
+    with mock.patch.object(gspread, "authorize", return_value=cliente), \
+            mock.patch.object(service_account.Credentials, "from_service_account_info", return_value=object()):
+        at = _nueva_app()
+        medidor = Medidor(at, cliente)
+
+        tracemalloc.start()
+        medidor.medir("carga_inicial_rh", at.run, 1)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        medidor.medir("rh_rerun_sin_cambios", at.run, repeticiones)
+        medidor.medir(
+            "rh_seleccion_trabajador",
+            lambda: _selectbox(at, "Selecciona un trabajador:").set_value(
+                _otra_opcion(_selectbox(at, "Selecciona un trabajador:"))).run(),
+            repeticiones,
+        )
+        medidor.medir(
+            "rh_cambio_slider",
+            lambda: at.slider(key="slider_CRITERIO").set_value(1 + at.slider(key="slider_CRITERIO").value % 4).run(),
+            repeticiones,
+        )
+        medidor.medir("rh_calcular_puntaje", lambda: _boton(at, "👁️ Calcular puntaje").click().run(), repeticiones)
+        medidor.medir("rh_guardar", lambda: _boton(at, "Guardar Evaluación").click().run(), repeticiones)
+
+        medidor.medir("admin_carga_inicial", lambda: at.sidebar.radio[0].set_value("Administrador").run(), 1)
+        medidor.medir("admin_login", lambda: at.text_input[0].input(CONTRASENA_ADMIN).run(), 1)
+        medidor.medir(
+            "admin_filtro_area",
+            lambda: _selectbox(at, "Filtrar por área:").set_value(_otra_opcion(_selectbox(at, "Filtrar por área:"))).run(),
+            repeticiones,
+        )
+        medidor.medir(
+            "admin_filtro_trabajador",
+            lambda: _selectbox(at, "Filtrar por trabajador:").set_value(
+                _otra_opcion(_selectbox(at, "Filtrar por trabajador:"))).run(),
+            repeticiones,
+        )
+        medidor.medir("admin_filtro_todos", lambda: _selectbox(at, "Filtrar por área:").set_value("Todos").run(), 1)
+
+        # Reinicio del proceso: la primera página se sirve desde la instantánea en disco
+        st.cache_resource.clear()
+        medidor.at = _nueva_app()
+        medidor.medir("carga_inicial_con_instantanea", medidor.at.run, 1)
+
+    return {
+        "filas": num_filas,
+        "memoria_pico_carga_mb": round(pico / 2**20, 2),
+        "acciones": medidor.resultados,
+    }
+
+
+# ===========================================================
+# SALIDA Y COMPARACIÓN
+# ===========================================================
+def _metadatos():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "streamlit": st.__version__,
+        "plataforma": platform.platform(),
+    }
+
+
+def comparar(actual, anterior):
+    """Imprime la variación de la mediana de latencia por acción entre dos corridas."""
+    previas = {e["filas"]: e for e in anterior["escalas"]}
+    for escala in actual["escalas"]:
+        previa = previas.get(escala["filas"])
+        if previa is None:
+            continue
+        print(f"\n== {escala['filas']} filas (vs. commit {anterior['metadatos'].get('commit')}) ==")
+        for accion, datos in escala["acciones"].items():
+            if accion not in previa["acciones"]:
+                continue
+            antes = previa["acciones"][accion]["latencia_ms"]["mediana"]
+            ahora = datos["latencia_ms"]["mediana"]
+            cambio = (ahora - antes) / antes * 100 if antes else 0
+            print(f"{accion:28s} {antes:10.1f} ms -> {ahora:10.1f} ms ({cambio:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--salida", default="bench_resultados.json")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior")
+    args = parser.parse_args(argv)
+
+    # La cola de escritura crea su diario en el directorio actual
+    directorio = tempfile.mkdtemp(prefix="bench_evaluacion_")
+    salida = os.path.abspath(args.salida)
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+    os.chdir(directorio)
+
+    resultado = {"metadatos": _metadatos(), "escalas": []}
+    for num_filas in args.filas:
+        print(f"Ejecutando escala de {num_filas} filas...", flush=True)
+        resultado["escalas"].append(ejecutar_escala(num_filas, args.repeticiones))
+
+    with open(salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+    print(f"Resultados guardados en {salida}")
+
+    if anterior:
+        comparar(resultado, anterior)
+
+
+if __name__ == "__main__":
+    main()
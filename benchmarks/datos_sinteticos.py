@@ -0,0 +1,39 @@
+import random
+
+from modelo_evaluaciones import ENCABEZADOS_EVALUACION, FACTORES
+
+# ===========================================================
+# HOJA "trabajadores" SINTÉTICA PARA BENCHMARKS
+# ===========================================================
+NUM_AREAS = 10
+
+
+def generar_hoja(num_filas, num_trabajadores=None, semilla=0):
+    """Encabezado + plantilla + historial de evaluaciones con ``num_filas`` filas de datos.
+
+    Las primeras filas son la plantilla (una por trabajador, sin evaluación) y el
+    resto son evaluaciones de trabajadores al azar, igual que en la hoja real.
+    """
+    azar = random.Random(semilla)
+    num_trabajadores = num_trabajadores or max(num_filas // 20, 10)
+    num_trabajadores = min(num_trabajadores, num_filas)
+
+    plantilla = []
+    for i in range(num_trabajadores):
+        plantilla.append([
+            f"Trabajador {i:05d}", f"CURP{i:014d}", f"RFC{i:010d}", f"Jefe {i % 50}",
+            f"Área {i % NUM_AREAS:02d}", f"Puesto {i % 7}", str(i % 5 + 1), "01/01/2020", "3", "8",
+            "Función 1", "Función 2", "Función 3", "Meta 1", "Meta 2", "Meta 3",
+            str(azar.randint(5, 20)), str(azar.randint(5, 20)), str(azar.randint(5, 20)),
+        ])
+
+    filas = [list(ENCABEZADOS_EVALUACION)] + plantilla
+    for _ in range(num_filas - num_trabajadores):
+        trab = azar.choice(plantilla)
+        metas_reales = [azar.randint(0, 20) for _ in range(3)]
+        resultados = [round(r / float(p) * 100, 2) for r, p in zip(metas_reales, trab[16:19])]
+        factores = [azar.randint(1, 4) for _ in FACTORES]
+        fila = trab + [azar.randint(1, 28), azar.randint(1, 12), azar.randint(2019, 2025)]
+        fila += metas_reales + resultados + factores + [sum(factores), "Comentario sintético"]
+        filas.append([str(x) for x in fila])
+    return filas
@@ -0,0 +1,163 @@
+import logging
+from threading import Lock
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================================
+# CARGA INCREMENTAL DE LA HOJA "trabajadores"
+# ===========================================================
+def filas_a_frame(filas, encabezados):
+    """Convierte filas de Sheets (de largo variable) en un DataFrame rellenado con ""."""
+    df = pd.DataFrame(filas)
+    df = df.reindex(columns=range(len(encabezados))).fillna("")
+    df.columns = encabezados
+    return df
+
+
+def letra_columna(indice):
+    """Letra A1 de la columna ``indice`` (0 → A, 26 → AA)."""
+    letras = ""
+    indice += 1
+    while indice:
+        indice, resto = divmod(indice - 1, 26)
+        letras = chr(ord("A") + resto) + letras
+    return letras
+
+
+def indice_columna(letras):
+    """Índice de la columna A1 ``letras`` (A → 0, AA → 26)."""
+    numero = 0
+    for letra in letras:
+        numero = numero * 26 + ord(letra) - ord("A") + 1
+    return numero - 1
+
+
+def rangos_contiguos(indices):
+    """Agrupa índices de columna en tramos contiguos: [0, 4, 5, 6] → [(0, 0), (4, 6)]."""
+    rangos = []
+    for i in sorted(indices):
+        if rangos and i == rangos[-1][1] + 1:
+            rangos[-1][1] = i
+        else:
+            rangos.append([i, i])
+    return [tuple(r) for r in rangos]
+
+
+class CargadorIncremental:
+    """Mantiene en memoria la hoja completa y solo descarga las filas nuevas.
+
+    La hoja únicamente crece con filas de evaluación agregadas al final, por lo
+    que basta recordar cuántas filas se han leído. En cada refresco se piden,
+    en una sola llamada ``batch_get``, el encabezado y las filas a partir de la
+    última fila conocida. Si el encabezado cambió o la última fila conocida ya
+    no coincide (se borraron o reordenaron filas), se hace una recarga completa.
+
+    Con ``proyeccion`` (función encabezado → nombres de columna) solo se leen
+    esas columnas: los tramos contiguos van como rangos del mismo ``batch_get``.
+    Las posiciones se calculan con ``encabezados_esperados`` hasta conocer el
+    encabezado real; si no coinciden, la lectura se repite una vez.
+    """
+
+    def __init__(self, obtener_hoja, ultima_columna="AP", al_leer_encabezados=None,
+                 proyeccion=None, encabezados_esperados=None):
+        self.obtener_hoja = obtener_hoja      # Función que devuelve el worksheet
+        self.al_leer_encabezados = al_leer_encabezados
+        self.ultima_columna = ultima_columna
+        self.proyeccion = proyeccion
+        self.encabezados = list(encabezados_esperados) if encabezados_esperados else None
+        self.df = None
+        self.filas_hoja = 0                   # Filas leídas, incluyendo el encabezado
+        self.ultima_fila = None               # Copia de la última fila leída
+        self.generacion = 0                   # Aumenta con cada recarga completa
+        self._lock = Lock()
+
+    def cargar(self):
+        with self._lock:
+            if self.df is None:
+                return self._recarga_completa()
+            return self._carga_incremental()
+
+    # -------------------------------------------------------
+    # Estrategias de lectura
+    # -------------------------------------------------------
+    def _recarga_completa(self):
+        encabezado, rangos, bloques = self._leer(1)
+        if self.proyeccion and encabezado and rangos != self._rangos(encabezado):
+            self.encabezados = encabezado  # Las columnas no estaban donde se esperaba
+            encabezado, rangos, bloques = self._leer(1)
+        num_filas = max((len(b) for b in bloques), default=0)
+        if not encabezado or not num_filas:
+            return pd.DataFrame()
+
+        self.encabezados = encabezado
+        if self.al_leer_encabezados:
+            self.al_leer_encabezados(self.encabezados)
+        self.df = self._a_frame(bloques, rangos, 1)
+        self.filas_hoja = num_filas
+        self.ultima_fila = self._fila(bloques, rangos, num_filas - 1)
+        self.generacion += 1
+        logger.info("Recarga completa de 'trabajadores': %d filas, %d rangos.", len(self.df), len(rangos))
+        return self._resultado()
+
+    def _carga_incremental(self):
+        encabezado, rangos, bloques = self._leer(self.filas_hoja)
+        num_filas = max((len(b) for b in bloques), default=0)
+
+        # La primera fila devuelta es la última que ya conocíamos
+        if encabezado != self.encabezados or not num_filas or self._fila(bloques, rangos, 0) != self.ultima_fila:
+            return self._recarga_completa()
+
+        if num_filas > 1:
+            nuevo = self._a_frame(bloques, rangos, 1)
+            self.df = pd.concat([self.df, nuevo], ignore_index=True)
+            self.filas_hoja += len(nuevo)
+            self.ultima_fila = self._fila(bloques, rangos, num_filas - 1)
+            logger.info("Carga incremental de 'trabajadores': %d filas nuevas.", len(nuevo))
+        return self._resultado()
+
+    # -------------------------------------------------------
+    # Rangos de la proyección
+    # -------------------------------------------------------
+    def _rangos(self, encabezado):
+        ultima = indice_columna(self.ultima_columna)
+        if not self.proyeccion or not encabezado:
+            return [(0, ultima)]
+        buscadas = {c.strip() for c in self.proyeccion(encabezado) if c}
+        return rangos_contiguos(i for i, c in enumerate(encabezado[:ultima + 1]) if c.strip() in buscadas)
+
+    def _leer(self, desde):
+        """Encabezado, rangos usados y un bloque de filas por rango desde la fila ``desde``."""
+        rangos = self._rangos(self.encabezados)
+        col = self.ultima_columna
+        respuesta = self.obtener_hoja().batch_get(
+            [f"A1:{col}1"] + [f"{letra_columna(i)}{desde}:{letra_columna(j)}" for i, j in rangos]
+        )
+        encabezado = list(respuesta[0][0]) if respuesta[0] else []
+        return encabezado, rangos, respuesta[1:]
+
+    @staticmethod
+    def _fila(bloques, rangos, n):
+        """Fila ``n`` con los tramos unidos y rellenados (para comparar filas)."""
+        fila = []
+        for (i, j), bloque in zip(rangos, bloques):
+            celdas = list(bloque[n]) if n < len(bloque) else []
+            fila += celdas + [""] * (j - i + 1 - len(celdas))
+        return fila
+
+    def _a_frame(self, bloques, rangos, inicio):
+        """Un frame por rango a partir de la fila ``inicio`` del bloque, unidos por columnas."""
+        if not self.proyeccion:
+            return filas_a_frame(bloques[0][inicio:], self.encabezados)
+        num_filas = max(len(b) for b in bloques) - inicio
+        partes = [
+            filas_a_frame(bloque[inicio:], self.encabezados[i:j + 1]).reindex(range(num_filas), fill_value="")
+            for (i, j), bloque in zip(rangos, bloques)
+        ]
+        return pd.concat(partes, axis=1)
+
+    def _resultado(self):
+        self.df.attrs["generacion"] = self.generacion
+        return self.df
@@ -0,0 +1,212 @@
+import json
+import logging
+import re
+import sqlite3
+import time
+from threading import Condition, Lock, Thread
+
+logger = logging.getLogger(__name__)
+
+
+MAX_RECHAZOS_POR_ENVIO = 10     # Filas apartadas como máximo en un mismo intento de envío
+
+
+def fila_invalida(error, num_filas):
+    """Índice de la fila que un 400 señala como inválida, o ``None``.
+
+    Google indica la fila culpable en el mensaje (``Invalid values[3][1]: ...``).
+    Cualquier otro error (401/403 permisos, 404 o 400 por una pestaña
+    renombrada, 429, 5xx, red) afecta a toda la solicitud, no a una fila.
+    """
+    if getattr(error, "code", None) != 400:
+        return None
+    coincidencia = re.search(r"values\[(\d+)\]", str(error))
+    if coincidencia and int(coincidencia.group(1)) < num_filas:
+        return int(coincidencia.group(1))
+    return None
+
+
+# ===========================================================
+# COLA DE ESCRITURA DIFERIDA (WRITE-BEHIND) CON DIARIO EN DISCO
+# ===========================================================
+class ColaEscritura:
+    """Cola de evaluaciones compartida por todo el proceso.
+
+    Cada fila aceptada se guarda primero en un diario SQLite (modo WAL), de
+    modo que un reinicio del contenedor no pierde evaluaciones pendientes.
+    Un hilo en segundo plano vacía el diario en lotes cuando se acumulan
+    ``tamano_lote`` filas o cuando la fila más antigua supera ``intervalo_seg``.
+
+    Un error que afecta a toda la solicitud (red, 429, 5xx, permisos, hoja
+    inexistente) detiene el vaciado: el lote queda en el diario, el error en
+    ``ultimo_error`` y se reintenta tras un intervalo. Solo cuando la API señala
+    una fila concreta (``fila_invalida``) esa fila pasa a la tabla
+    ``rechazadas`` y se reenvía el resto, hasta ``MAX_RECHAZOS_POR_ENVIO`` por
+    intento; ``reintentar_rechazadas`` las devuelve a la cola.
+
+    La entrega es "al menos una vez": si Sheets responde 5xx o se corta la red
+    después de escribir, el lote se reenvía y esas filas quedan duplicadas.
+    Nunca se pierde una evaluación, pero puede aparecer dos veces.
+    """
+
+    def __init__(self, ruta, enviar, tamano_lote=10, intervalo_seg=60, max_lote=500):
+        self.ruta = ruta
+        self.enviar = enviar                # Función que recibe una lista de filas
+        self.tamano_lote = tamano_lote      # Disparador por tamaño
+        self.intervalo_seg = intervalo_seg  # Disparador por tiempo
+        self.max_lote = max_lote            # Filas máximas por llamada a Sheets
+        self.ultimo_envio = 0
+        self.ultimo_error = None
+
+        self._lock = Lock()
+        self._condicion = Condition(self._lock)
+        self._envio = Lock()                # Un solo envío a la vez
+        self._detener = False
+
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS pendientes ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, creada REAL NOT NULL, fila TEXT NOT NULL)"
+        )
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS rechazadas ("
+            "id INTEGER PRIMARY KEY, creada REAL NOT NULL, fila TEXT NOT NULL, error TEXT, rechazada REAL)"
+        )
+
+        self._hilo = Thread(target=self._ciclo, name="cola-escritura", daemon=True)
+        self._hilo.start()
+
+    # -------------------------------------------------------
+    # API pública
+    # -------------------------------------------------------
+    def encolar(self, fila):
+        """Registra una fila en el diario y despierta al hilo si el lote está lleno."""
+        with self._condicion:
+            self._conexion.execute(
+                "INSERT INTO pendientes (creada, fila) VALUES (?, ?)",
+                (time.time(), json.dumps(fila, ensure_ascii=False)),
+            )
+            if self._contar() >= self.tamano_lote:
+                self._condicion.notify()
+
+    def pendientes(self):
+        """Número de filas aceptadas que aún no llegan a Google Sheets."""
+        with self._lock:
+            return self._contar()
+
+    def rechazadas(self):
+        """Filas que la API señaló como inválidas: ``[(fila, error), ...]``."""
+        with self._lock:
+            registros = self._conexion.execute("SELECT fila, error FROM rechazadas ORDER BY id").fetchall()
+        return [(json.loads(fila), error) for fila, error in registros]
+
+    def reintentar_rechazadas(self):
+        """Devuelve las filas rechazadas a la cola (p. ej. tras corregir el encabezado)."""
+        with self._condicion:
+            self._conexion.execute("BEGIN")
+            self._conexion.execute("INSERT INTO pendientes (creada, fila) SELECT creada, fila FROM rechazadas ORDER BY id")
+            self._conexion.execute("DELETE FROM rechazadas")
+            self._conexion.execute("COMMIT")
+            self._condicion.notify()
+
+    def vaciar(self):
+        """Envía de inmediato todo lo pendiente."""
+        while self._enviar_lote():
+            pass
+
+    def detener(self):
+        """Detiene el hilo y envía lo pendiente; se registra con ``atexit`` al cerrar el proceso."""
+        with self._condicion:
+            self._detener = True
+            self._condicion.notify()
+        self._hilo.join(timeout=5)
+        self.vaciar()
+
+    # -------------------------------------------------------
+    # Hilo de vaciado
+    # -------------------------------------------------------
+    def _contar(self):
+        return self._conexion.execute("SELECT COUNT(*) FROM pendientes").fetchone()[0]
+
+    def _antiguedad(self):
+        fila = self._conexion.execute("SELECT MIN(creada) FROM pendientes").fetchone()
+        return None if fila[0] is None else time.time() - fila[0]
+
+    def _ciclo(self):
+        while True:
+            with self._condicion:
+                if self._detener:
+                    return
+                antiguedad = self._antiguedad()
+                if antiguedad is None:
+                    espera = None
+                elif self._contar() >= self.tamano_lote:
+                    espera = 0
+                else:
+                    espera = max(self.intervalo_seg - antiguedad, 0)
+                if espera is None or espera > 0:
+                    self._condicion.wait(timeout=espera)
+                    continue
+            if not self._enviar_lote():
+                # Falló el envío: reintentar tras un intervalo sin perder filas
+                with self._condicion:
+                    self._condicion.wait(timeout=min(self.intervalo_seg, 30))
+
+    def _enviar_lote(self):
+        with self._envio:
+            return self._enviar_lote_exclusivo()
+
+    def _enviar_lote_exclusivo(self):
+        with self._lock:
+            registros = self._conexion.execute(
+                "SELECT id, fila FROM pendientes ORDER BY id LIMIT ?", (self.max_lote,)
+            ).fetchall()
+        if not registros:
+            return False
+
+        return self._enviar_registros(registros)
+
+    def _enviar_registros(self, registros):
+        """Envía ``registros``, apartando las filas que la API señale como inválidas.
+
+        Devuelve False si el lote quedó pendiente (el vaciado se detiene).
+        """
+        rechazos = 0
+        while True:
+            filas = [json.loads(fila) for _, fila in registros]
+            try:
+                self.enviar(filas)
+                break
+            except Exception as e:
+                self.ultimo_error = str(e)
+                indice = fila_invalida(e, len(filas))
+                if indice is None or rechazos == MAX_RECHAZOS_POR_ENVIO:
+                    logger.warning("Error al enviar lote de %d evaluaciones: %s", len(filas), e)
+                    return False
+                self._rechazar(registros[indice][0], str(e))
+                registros = registros[:indice] + registros[indice + 1:]
+                rechazos += 1
+                if not registros:
+                    self.ultimo_error = None
+                    return True
+
+        # Solo se borran del diario cuando Google Sheets confirmó la escritura
+        with self._lock:
+            self._conexion.executemany("DELETE FROM pendientes WHERE id = ?", [(id_,) for id_, _ in registros])
+        self.ultimo_envio = time.time()
+        self.ultimo_error = None
+        logger.info("Lote de %d evaluaciones enviado a Google Sheets.", len(filas))
+        return True
+
+    def _rechazar(self, id_, error):
+        with self._lock:
+            self._conexion.execute("BEGIN")
+            self._conexion.execute(
+                "INSERT INTO rechazadas (id, creada, fila, error, rechazada) "
+                "SELECT id, creada, fila, ?, ? FROM pendientes WHERE id = ?", (error, time.time(), id_)
+            )
+            self._conexion.execute("DELETE FROM pendientes WHERE id = ?", (id_,))
+            self._conexion.execute("COMMIT")
+        logger.error("Evaluación %d rechazada por la API: %s", id_, error)
@@ -0,0 +1,211 @@
+from collections import Counter
+from threading import Lock
+
+import numpy as np
+import pandas as pd
+
+from modelo_evaluaciones import COL_AREA, COL_NOMBRE, COL_PERIODO, FACTORES
+
+TODOS = "Todos"
+
+
+# ===========================================================
+# CELDA: ACUMULADOR COMBINABLE
+# ===========================================================
+class Celda:
+    """Histograma de puntajes más sumas por factor.
+
+    El puntaje total es entero y de rango pequeño, así que un histograma guarda
+    toda la información necesaria para conteo, suma, media y cuantiles exactos,
+    y dos celdas se combinan sumando sus histogramas.
+    """
+
+    __slots__ = ("hist", "suma_factores", "n_factores")
+
+    def __init__(self):
+        self.hist = Counter()
+        self.suma_factores = np.zeros(len(FACTORES))
+        self.n_factores = np.zeros(len(FACTORES))
+
+    def copia(self):
+        celda = Celda()
+        celda.agregar(self.hist, self.suma_factores, self.n_factores)
+        return celda
+
+    def agregar(self, hist, suma_factores, n_factores):
+        self.hist.update(hist)
+        self.suma_factores += suma_factores
+        self.n_factores += n_factores
+
+    @property
+    def n(self):
+        return sum(self.hist.values())
+
+    @property
+    def suma(self):
+        return sum(valor * veces for valor, veces in self.hist.items())
+
+    @property
+    def media(self):
+        n = self.n
+        return self.suma / n if n else float("nan")
+
+    def cuantil(self, q):
+        """Cuantil con interpolación lineal (equivalente a ``numpy.quantile``)."""
+        n = self.n
+        if not n:
+            return float("nan")
+        posicion = q * (n - 1)
+        bajo, alto = int(np.floor(posicion)), int(np.ceil(posicion))
+        valores = self._valores_en((bajo, alto))
+        return valores[0] + (valores[1] - valores[0]) * (posicion - bajo)
+
+    def _valores_en(self, indices):
+        resultado, acumulado = [], 0
+        pendientes = list(indices)
+        for valor in sorted(self.hist):
+            acumulado += self.hist[valor]
+            while pendientes and pendientes[0] < acumulado:
+                resultado.append(valor)
+                pendientes.pop(0)
+            if not pendientes:
+                break
+        return resultado
+
+    def estadisticas_caja(self):
+        """Estadísticas para dibujar una caja sin enviar los puntos crudos."""
+        return {
+            "n": self.n,
+            "min": min(self.hist),
+            "q1": self.cuantil(0.25),
+            "mediana": self.cuantil(0.5),
+            "q3": self.cuantil(0.75),
+            "max": max(self.hist),
+            "media": self.media,
+        }
+
+    def promedio_factores(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            promedios = self.suma_factores / self.n_factores
+        return {f: float(p) for f, p in zip(FACTORES, promedios) if not np.isnan(p)}
+
+
+# ===========================================================
+# CUBO ÁREA × TRABAJADOR × PERIODO
+# ===========================================================
+class CuboEvaluaciones:
+    """Agregados precalculados para el panel administrativo.
+
+    ``celdas`` guarda una celda por (área, trabajador, periodo) y ``resumenes``
+    los acumulados por cada combinación de filtros (área o "Todos", trabajador o
+    "Todos"). ``sincronizar`` ingiere solo las filas nuevas del DataFrame tipado,
+    así que responder a un cambio de filtro es una búsqueda en diccionario.
+
+    El cubo se comparte entre sesiones: las consultas toman el mismo lock que
+    ``sincronizar`` y ``resumen`` entrega una copia de la celda.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._reiniciar(None)
+
+    def _reiniciar(self, generacion):
+        self.generacion = generacion
+        self.filas_procesadas = 0
+        self.celdas = {}
+        self.resumenes = {}
+        self.claves_por_filtro = {}
+        self.nombres_por_area = {}
+        self._series = {}
+
+    # -------------------------------------------------------
+    # Mantenimiento incremental
+    # -------------------------------------------------------
+    def sincronizar(self, df):
+        with self._lock:
+            generacion = df.attrs.get("generacion")
+            if generacion != self.generacion or len(df) < self.filas_procesadas:
+                self._reiniciar(generacion)
+            if len(df) > self.filas_procesadas:
+                self._ingerir(df.iloc[self.filas_procesadas:], df.attrs["columnas"])
+                self.filas_procesadas = len(df)
+                self._series.clear()
+
+    def _ingerir(self, df, columnas):
+        areas, nombres = df[COL_AREA].astype(str), df[COL_NOMBRE].astype(str)
+        for area, nombre in set(zip(areas, nombres)):
+            self.nombres_por_area.setdefault(area, set()).add(nombre)
+
+        col_puntaje = columnas["puntaje"]
+        if not col_puntaje or COL_PERIODO not in df.columns:
+            return
+        ev = pd.DataFrame({
+            COL_AREA: areas, COL_NOMBRE: nombres,
+            COL_PERIODO: df[COL_PERIODO], "puntaje": df[col_puntaje],
+        })
+        for factor in FACTORES:
+            col = columnas["factores"].get(factor)
+            ev[factor] = df[col] if col else np.nan
+        ev = ev[ev["puntaje"].notna() & ev[COL_PERIODO].notna()]
+        if ev.empty:
+            return
+
+        claves = [COL_AREA, COL_NOMBRE, COL_PERIODO]
+        hist = ev.groupby(claves + ["puntaje"]).size()
+        factores = ev.groupby(claves)[list(FACTORES)]
+        sumas, conteos = factores.sum(), factores.count()
+
+        hist_por_clave = {}
+        for (area, nombre, periodo, puntaje), veces in hist.items():
+            hist_por_clave.setdefault((area, nombre, periodo), {})[float(puntaje)] = int(veces)
+
+        for clave, suma, conteo in zip(sumas.index, sumas.to_numpy(), conteos.to_numpy()):
+            area, nombre, _ = clave
+            destinos = [(area, nombre), (area, TODOS), (TODOS, nombre), (TODOS, TODOS)]
+            for filtro in destinos:
+                self.claves_por_filtro.setdefault(filtro, set()).add(clave)
+            for destino in [self.celdas.setdefault(clave, Celda())] + [
+                self.resumenes.setdefault(filtro, Celda()) for filtro in destinos
+            ]:
+                destino.agregar(hist_por_clave[clave], suma, conteo)
+
+    # -------------------------------------------------------
+    # Consultas del panel
+    # -------------------------------------------------------
+    def areas(self):
+        with self._lock:
+            return sorted(self.nombres_por_area)
+
+    def nombres(self, area=TODOS):
+        with self._lock:
+            if area == TODOS:
+                return sorted(set().union(*self.nombres_por_area.values()))
+            return sorted(self.nombres_por_area.get(area, ()))
+
+    def resumen(self, area=TODOS, trabajador=TODOS):
+        """Copia del acumulado del filtro o ``None`` si no hay evaluaciones."""
+        with self._lock:
+            celda = self.resumenes.get((area, trabajador))
+            return None if celda is None else celda.copia()
+
+    def serie(self, area=TODOS, trabajador=TODOS):
+        """Promedio por trabajador y periodo dentro del filtro (en caché por filtro)."""
+        filtro = (area, trabajador)
+        with self._lock:
+            if filtro not in self._series:
+                claves = sorted(self.claves_por_filtro.get(filtro, ()), key=lambda c: (c[2], c[1]))
+                self._series[filtro] = pd.DataFrame(
+                    [(a, n, p, self.celdas[(a, n, p)].n, self.celdas[(a, n, p)].media) for a, n, p in claves],
+                    columns=[COL_AREA, COL_NOMBRE, COL_PERIODO, "Evaluaciones", "Promedio"],
+                )
+            return self._series[filtro]
+
+    def cajas(self, area=TODOS, trabajador=TODOS):
+        """Estadísticas de caja por área para el filtro seleccionado."""
+        filas = []
+        with self._lock:
+            for a in (sorted(self.nombres_por_area) if area == TODOS else [area]):
+                celda = self.resumenes.get((a, trabajador))
+                if celda is not None:
+                    filas.append({COL_AREA: a, **celda.estadisticas_caja()})
+        return pd.DataFrame(filas)
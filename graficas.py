@@ -0,0 +1,73 @@
+import plotly.graph_objects as go
+
+from modelo_evaluaciones import COL_AREA, COL_NOMBRE, COL_PERIODO, etiqueta_periodo
+
+OTROS = "Otros"
+
+
+# ===========================================================
+# MODO DE GRÁFICAS PARA GRANDES VOLÚMENES
+# ===========================================================
+def es_volumen_grande(serie, umbral_filas, umbral_trazas):
+    """Indica si la serie (trabajador × periodo) es demasiado grande para barras agrupadas."""
+    return len(serie) > umbral_filas or serie[COL_NOMBRE].nunique() > umbral_trazas
+
+
+def agrupar_serie(serie, columna, top_n=None):
+    """Promedio ponderado por ``columna`` y periodo.
+
+    Con ``top_n`` conserva los grupos con más evaluaciones y junta el resto en
+    "Otros", de modo que la gráfica tiene como máximo ``top_n + 1`` trazas.
+    """
+    serie = serie.assign(
+        grupo=serie[columna].astype(str),
+        ponderado=serie["Promedio"] * serie["Evaluaciones"],
+    )
+    if top_n is not None:
+        conteos = serie.groupby("grupo")["Evaluaciones"].sum().sort_values(ascending=False, kind="stable")
+        principales = set(conteos.index[:top_n])
+        serie["grupo"] = serie["grupo"].where(serie["grupo"].isin(principales), OTROS)
+
+    agrupada = serie.groupby(["grupo", COL_PERIODO], as_index=False)[["ponderado", "Evaluaciones"]].sum()
+    agrupada["Promedio"] = agrupada["ponderado"] / agrupada["Evaluaciones"]
+    return agrupada.drop(columns="ponderado").sort_values(COL_PERIODO)
+
+
+def figura_evolucion_gl(agrupada, titulo_leyenda):
+    """Una traza WebGL (``Scattergl``) por grupo con el promedio por periodo."""
+    fig = go.Figure()
+    for grupo, datos in agrupada.groupby("grupo", sort=False):
+        fig.add_trace(go.Scattergl(
+            x=etiqueta_periodo(datos[COL_PERIODO]),
+            y=datos["Promedio"].round(2),
+            mode="lines+markers",
+            name=grupo,
+            customdata=datos["Evaluaciones"],
+            hovertemplate="%{x}<br>Promedio: %{y:.1f}<br>Evaluaciones: %{customdata}",
+        ))
+    fig.update_layout(
+        title="Evolución del Puntaje Promedio (Mes/Año)",
+        xaxis_title="Periodo (Mes/Año)",
+        yaxis_title="Puntaje total",
+        legend_title=titulo_leyenda,
+    )
+    return fig
+
+
+def figura_cajas(cajas):
+    """Cajas a partir de estadísticas precalculadas (sin puntos crudos)."""
+    fig = go.Figure(go.Box(
+        x=cajas[COL_AREA],
+        lowerfence=cajas["min"],
+        q1=cajas["q1"],
+        median=cajas["mediana"],
+        q3=cajas["q3"],
+        upperfence=cajas["max"],
+        mean=cajas["media"],
+    ))
+    fig.update_layout(
+        title="Distribución del Puntaje por Área",
+        xaxis_title=COL_AREA,
+        yaxis_title="Puntaje total"
+    )
+    return fig
@@ -0,0 +1,130 @@
+import io
+from datetime import datetime
+
+import pandas as pd
+
+from indice_plantilla import COL_CURP
+from modelo_evaluaciones import COL_NOMBRE, COLUMNAS_FIJAS, FACTORES
+
+COLUMNAS_METAS = ["Meta 1 real", "Meta 2 real", "Meta 3 real"]
+COLUMNAS_PLANTILLA = [COL_CURP, COL_NOMBRE] + COLUMNAS_METAS + list(FACTORES) + ["Comentarios"]
+TAMANO_BLOQUE = 500     # Filas por values_append: mil evaluaciones = 2 llamadas
+
+
+# ===========================================================
+# LECTURA DEL ARCHIVO
+# ===========================================================
+def plantilla_csv():
+    """CSV vacío con las columnas que espera la importación."""
+    return pd.DataFrame(columns=COLUMNAS_PLANTILLA).to_csv(index=False).encode("utf-8-sig")
+
+
+def leer_archivo(archivo):
+    """Lee un CSV o XLSX subido (todo como texto).
+
+    XLSX requiere ``openpyxl``; si no está instalado se pide usar CSV.
+    """
+    nombre = getattr(archivo, "name", "").lower()
+    if nombre.endswith((".xlsx", ".xlsm")):
+        try:
+            import openpyxl  # noqa: F401
+        except ImportError:
+            raise ValueError("Para importar XLSX instala openpyxl (pip install openpyxl) o sube un CSV.")
+        df = pd.read_excel(archivo, dtype=str)
+    else:
+        contenido = archivo.read() if hasattr(archivo, "read") else archivo
+        df = pd.read_csv(io.BytesIO(contenido), dtype=str, encoding="utf-8-sig")
+    df.columns = df.columns.str.strip()
+    return df.fillna("")
+
+
+# ===========================================================
+# VALIDACIÓN Y CÁLCULO VECTORIZADO
+# ===========================================================
+def preparar_filas(df, indice, fecha=None):
+    """Valida el archivo contra la plantilla y arma las filas a escribir.
+
+    ``indice`` es el ``IndicePlantilla`` sincronizado. El trabajador se
+    identifica por CURP y, si la celda está vacía o no coincide, por nombre. Devuelve
+    ``(filas, errores)``: filas en el orden de la hoja (columnas fijas + día,
+    mes, año, metas, resultados, factores, puntaje y comentarios) y un
+    DataFrame con el número de fila del archivo y el motivo de cada rechazo.
+    """
+    faltantes = [c for c in COLUMNAS_METAS + list(FACTORES) if c not in df.columns]
+    if faltantes or (COL_CURP not in df.columns and COL_NOMBRE not in df.columns):
+        raise ValueError(f"Faltan columnas en el archivo: {', '.join(faltantes) or COL_CURP + ' o ' + COL_NOMBRE}")
+
+    df = df.reset_index(drop=True)
+    registros, nombre_por_curp = indice.copia_registros()
+    plantilla = pd.DataFrame(list(registros.values()), columns=COLUMNAS_FIJAS).fillna("")
+    errores = pd.Series("", index=df.index)
+
+    # Trabajador: CURP primero (las vacías no cuentan), nombre como respaldo
+    nombre = pd.Series(pd.NA, index=df.index, dtype="object")
+    if COL_CURP in df.columns:
+        curp = df[COL_CURP].str.strip().str.upper().replace("", pd.NA)
+        nombre = curp.map(nombre_por_curp).astype("object")
+    if COL_NOMBRE in df.columns:
+        conocido = df[COL_NOMBRE].str.strip().where(df[COL_NOMBRE].str.strip().isin(registros.keys()))
+        nombre = nombre.fillna(conocido)
+    errores = errores.mask(nombre.isna(), "Trabajador no encontrado en la plantilla")
+
+    # Metas reales (números >= 0) y factores (enteros de 1 a 4)
+    # (vacía cuenta como 0, igual que el valor inicial del formulario)
+    metas = df[COLUMNAS_METAS].apply(pd.to_numeric, errors="coerce").astype("float64")
+    metas_invalidas = (metas.isna() & df[COLUMNAS_METAS].ne("")).any(axis=1) | (metas < 0).any(axis=1)
+    metas = metas.fillna(0.0)
+    errores = errores.mask(errores.eq("") & metas_invalidas, "Meta real no numérica o negativa")
+
+    factores = df[list(FACTORES)].apply(pd.to_numeric, errors="coerce")
+    factores_invalidos = ~(factores.isin([1, 2, 3, 4])).all(axis=1)
+    errores = errores.mask(errores.eq("") & factores_invalidos, "Factor fuera del rango 1-4")
+
+    validas = errores.eq("")
+    rechazos = pd.DataFrame({"Fila": df.index[~validas] + 2, "Motivo": errores[~validas]}).reset_index(drop=True)
+    if not validas.any():
+        return [], rechazos
+
+    # Columnas fijas de la plantilla y cálculos de una sola pasada
+    fijas = plantilla.set_index(COL_NOMBRE, drop=False).loc[nombre[validas]].reset_index(drop=True)
+    metas = metas[validas].reset_index(drop=True)
+    factores = factores[validas].astype(int).reset_index(drop=True)
+    prog = fijas[["Meta 1 prog", "Meta 2 prog", "Meta 3 prog"]].apply(pd.to_numeric, errors="coerce").fillna(0.0)
+    prog.columns = COLUMNAS_METAS
+    resultados = (metas / prog.where(prog != 0) * 100).round(2).fillna(0)
+    resultados.columns = ["Resultado 1", "Resultado 2", "Resultado 3"]
+
+    fecha = fecha or datetime.now()
+    salida = pd.concat([
+        fijas[COLUMNAS_FIJAS].astype(str),
+        pd.DataFrame({"Día": fecha.day, "Mes": fecha.month, "Año": fecha.year}, index=fijas.index).astype(str),
+        metas.astype(str),
+        resultados.astype(str),
+        factores.astype(str),
+        factores.sum(axis=1).astype(str).rename("Puntaje total"),
+        (df.loc[validas, "Comentarios"] if "Comentarios" in df.columns
+         else pd.Series("", index=df.index[validas])).reset_index(drop=True).rename("Comentarios"),
+    ], axis=1)
+    return salida.values.tolist(), rechazos
+
+
+# ===========================================================
+# ESCRITURA POR BLOQUES
+# ===========================================================
+def escribir_por_bloques(agregar_filas, filas, tamano_bloque=TAMANO_BLOQUE, al_avanzar=None, desde=0):
+    """Envía ``filas[desde:]`` en bloques grandes; devuelve cuántas hay escritas en total.
+
+    ``al_avanzar(hechas, total)`` recibe el total acumulado tras cada bloque.
+    Si un bloque falla, la excepción se propaga y el último ``hechas``
+    reportado es el ``desde`` con el que se reanuda: los bloques confirmados no
+    se repiten, pero el que falló se reenvía completo y, si Sheets llegó a
+    escribirlo (p. ej. respondió 5xx), queda duplicado (entrega al menos una vez).
+    """
+    escritas = desde
+    for inicio in range(desde, len(filas), tamano_bloque):
+        bloque = filas[inicio:inicio + tamano_bloque]
+        agregar_filas(bloque)
+        escritas += len(bloque)
+        if al_avanzar:
+            al_avanzar(escritas, len(filas))
+    return escritas
@@ -0,0 +1,79 @@
+from bisect import insort
+from threading import Lock
+
+from modelo_evaluaciones import COL_AREA, COL_NOMBRE, COLUMNAS_FIJAS
+
+COL_CURP = "C.U.R.P."
+
+
+# ===========================================================
+# ÍNDICE DE PLANTILLA PARA EL MODO RH
+# ===========================================================
+class IndicePlantilla:
+    """Índice de trabajadores construido una vez por refresco de datos.
+
+    - ``nombres_por_area``: área → lista ordenada de nombres.
+    - ``registros``: nombre → datos personales y metas (columnas fijas), tomados
+      de la primera fila del trabajador, igual que ``drop_duplicates``.
+    - ``nombre_por_curp``: CURP → nombre.
+
+    Como ``CuboEvaluaciones``, ``sincronizar`` solo procesa las filas nuevas y
+    las consultas toman el mismo lock (el índice se comparte entre sesiones).
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._reiniciar(None)
+
+    def _reiniciar(self, generacion):
+        self.generacion = generacion
+        self.filas_procesadas = 0
+        self.nombres_por_area = {}
+        self.registros = {}
+        self.nombre_por_curp = {}
+
+    def sincronizar(self, df):
+        with self._lock:
+            generacion = df.attrs.get("generacion")
+            if generacion != self.generacion or len(df) < self.filas_procesadas:
+                self._reiniciar(generacion)
+            if len(df) > self.filas_procesadas:
+                self._ingerir(df.iloc[self.filas_procesadas:])
+                self.filas_procesadas = len(df)
+
+    def _ingerir(self, df):
+        columnas = [c for c in COLUMNAS_FIJAS if c in df.columns]
+        nuevos = df.drop_duplicates(subset=[COL_NOMBRE])
+        nuevos = nuevos[~nuevos[COL_NOMBRE].astype(str).isin(self.registros.keys())]
+        for registro in nuevos[columnas].astype(object).to_dict("records"):
+            nombre, area = str(registro[COL_NOMBRE]), str(registro[COL_AREA])
+            self.registros[nombre] = registro
+            insort(self.nombres_por_area.setdefault(area, []), nombre)
+            curp = str(registro.get(COL_CURP) or "").strip().upper()
+            if curp:  # Una CURP vacía no identifica a nadie
+                self.nombre_por_curp.setdefault(curp, nombre)
+
+    # -------------------------------------------------------
+    # Consultas
+    # -------------------------------------------------------
+    def areas(self):
+        with self._lock:
+            return sorted(self.nombres_por_area)
+
+    def nombres(self, area):
+        with self._lock:
+            return list(self.nombres_por_area.get(area, []))  # Copia: insort la modifica en sitio
+
+    def registro(self, nombre):
+        with self._lock:
+            return self.registros.get(nombre)
+
+    def registro_por_curp(self, curp):
+        with self._lock:
+            nombre = self.nombre_por_curp.get(str(curp).strip().upper())
+            return None if nombre is None else self.registros[nombre]
+
+    def copia_registros(self):
+        """``(registros, nombre_por_curp)`` copiados, para recorrerlos sin el lock."""
+        with self._lock:
+            return dict(self.registros), dict(self.nombre_por_curp)
@@ -0,0 +1,143 @@
+import logging
+import os
+import time
+from threading import Lock, Thread
+
+import pandas as pd
+
+from metricas import METRICAS
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================================
+# INSTANTÁNEA EN DISCO CON STALE-WHILE-REVALIDATE
+# ===========================================================
+class InstantaneaDatos:
+    """Último frame cargado, persistido en Parquet y servido sin esperas.
+
+    - Al arrancar lee la instantánea del disco, así la primera página tras un
+      despliegue o reinicio no espera a Sheets.
+    - Cuando los datos superan ``max_edad_seg`` se siguen sirviendo mientras un
+      hilo en segundo plano los refresca; ninguna sesión se bloquea.
+    - Solo la primera carga sin instantánea en disco es síncrona.
+
+    En disco se guarda el frame crudo (texto); ``preparar(crudo, previo)``
+    (p. ej. ``normalizar_incremental``) se aplica una vez por refresco, no en
+    cada rerun, y recibe el frame preparado anterior para reutilizarlo. El frame
+    leído del disco recibe una ``generacion`` propia para que el cubo y el
+    índice de plantilla se reconstruyan cuando llegue la primera carga real.
+    """
+
+    def __init__(self, ruta, cargar, preparar=lambda df, previo=None: df, max_edad_seg=60):
+        self.ruta = ruta
+        self.cargar = cargar                # Función que devuelve el frame crudo
+        self.preparar = preparar
+        self.max_edad_seg = max_edad_seg
+        self.df = None
+        self.actualizado = 0.0              # Momento (epoch) de los datos servidos
+        self.ultimo_intento = 0.0
+        self.ultimo_error = None
+        self.vencida = False                # Marcada por invalidar(): refrescar ya
+        self._guardado = None               # (generación, filas) de lo escrito en disco
+        self._refresco = Lock()             # Un solo refresco a la vez
+        self._leer_disco()
+
+    # -------------------------------------------------------
+    # API pública
+    # -------------------------------------------------------
+    def obtener(self):
+        """Frame actual; si está vencido, lanza el refresco en segundo plano.
+
+        Cada lectura cuenta en ``instantanea_lecturas_total`` según cómo se
+        sirvió: ``fresca`` (acierto), ``vencida`` (acierto con refresco en
+        fondo) o ``sincrona`` (fallo: se esperó a la carga).
+        """
+        if self.df is None:
+            METRICAS.contar("instantanea_lecturas_total", resultado="sincrona")
+            with self._refresco:
+                if self.df is None:
+                    self._refrescar()
+            return self.df
+        if self.vencida or time.time() - max(self.actualizado, self.ultimo_intento) > self.max_edad_seg:
+            METRICAS.contar("instantanea_lecturas_total", resultado="vencida")
+            self._lanzar_refresco()
+        else:
+            METRICAS.contar("instantanea_lecturas_total", resultado="fresca")
+        return self.df
+
+    def edad(self):
+        """Segundos desde que se obtuvieron los datos que se están sirviendo."""
+        return time.time() - self.actualizado if self.df is not None else None
+
+    def actualizando(self):
+        return self._refresco.locked()
+
+    def invalidar(self):
+        """Hace que la siguiente lectura dispare un refresco (los datos se siguen sirviendo)."""
+        self.vencida = True
+
+    # -------------------------------------------------------
+    # Refresco
+    # -------------------------------------------------------
+    def _lanzar_refresco(self):
+        if not self._refresco.acquire(blocking=False):
+            return  # Ya hay un refresco en curso
+        Thread(target=self._refrescar_en_fondo, name="refresco-instantanea", daemon=True).start()
+
+    def _refrescar_en_fondo(self):
+        try:
+            self._refrescar()
+        except Exception as e:
+            self.ultimo_error = f"{type(e).__name__}: {e}"
+            METRICAS.contar("instantanea_refrescos_total", resultado="error")
+            logger.exception("No se pudo refrescar la instantánea; se siguen sirviendo los datos anteriores.")
+        finally:
+            self._refresco.release()
+
+    def _refrescar(self):
+        self.ultimo_intento, self.vencida = time.time(), False
+        inicio = time.perf_counter()
+        crudo = self.cargar()
+        df = self.preparar(crudo, self.df)
+        self.df, self.actualizado, self.ultimo_error = df, self.ultimo_intento, None
+        METRICAS.contar("instantanea_refrescos_total", resultado="ok")
+        METRICAS.observar("instantanea_refresco_segundos", time.perf_counter() - inicio)
+        self._escribir_disco(crudo)
+
+    # -------------------------------------------------------
+    # Disco
+    # -------------------------------------------------------
+    def _leer_disco(self):
+        if not os.path.exists(self.ruta):
+            return
+        try:
+            crudo = pd.read_parquet(self.ruta)
+        except Exception:
+            logger.warning("Instantánea ilegible en %s; se ignora.", self.ruta, exc_info=True)
+            return
+        modificada = os.path.getmtime(self.ruta)
+        crudo.attrs["generacion"] = f"instantanea-{modificada}"
+        self.df = self.preparar(crudo)
+        self.actualizado = modificada
+
+    def _escribir_disco(self, crudo):
+        """Reemplaza el archivo de forma atómica, solo si el frame cambió.
+
+        Si no cambió, solo se actualiza su mtime: al arrancar, ``actualizado``
+        se toma de ahí y debe reflejar el último refresco exitoso.
+        """
+        firma = (crudo.attrs.get("generacion"), len(crudo))
+        if firma == self._guardado:
+            try:
+                os.utime(self.ruta)
+            except OSError:
+                logger.warning("No se pudo actualizar la fecha de %s.", self.ruta, exc_info=True)
+            return
+        temporal = f"{self.ruta}.tmp"
+        try:
+            crudo.to_parquet(temporal, index=False)
+            os.replace(temporal, self.ruta)
+            self._guardado = firma
+        except Exception:
+            logger.warning("No se pudo guardar la instantánea en %s.", self.ruta, exc_info=True)
@@ -0,0 +1,169 @@
+import json
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Límites (segundos) de los histogramas de latencia, al estilo Prometheus
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+# ===========================================================
+# HISTOGRAMA Y REGISTRO DE MÉTRICAS
+# ===========================================================
+class Histograma:
+    __slots__ = ("conteos", "suma", "n")
+
+    def __init__(self):
+        self.conteos = [0] * (len(BUCKETS) + 1)  # El último es +Inf
+        self.suma = 0.0
+        self.n = 0
+
+    def observar(self, valor):
+        self.conteos[bisect_left(BUCKETS, valor)] += 1
+        self.suma += valor
+        self.n += 1
+
+    def cuantil(self, q):
+        """Cuantil aproximado: límite superior del bucket que lo contiene."""
+        objetivo, acumulado = q * self.n, 0
+        for limite, conteo in zip(BUCKETS + (float("inf"),), self.conteos):
+            acumulado += conteo
+            if acumulado >= objetivo:
+                return limite
+        return float("inf")
+
+
+class Metricas:
+    """Contadores e histogramas del proceso, con exportación a texto Prometheus."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self.contadores = {}    # (nombre, etiquetas) -> valor
+        self.histogramas = {}   # (nombre, etiquetas) -> Histograma
+
+    def contar(self, nombre, valor=1, **etiquetas):
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._lock:
+            self.contadores[clave] = self.contadores.get(clave, 0) + valor
+
+    def observar(self, nombre, valor, **etiquetas):
+        clave = (nombre, tuple(sorted(etiquetas.items())))
+        with self._lock:
+            self.histogramas.setdefault(clave, Histograma()).observar(valor)
+
+    def valor(self, nombre, **etiquetas):
+        return self.contadores.get((nombre, tuple(sorted(etiquetas.items()))), 0)
+
+    @contextmanager
+    def medir_llamada_sheets(self, metodo):
+        """Cuenta y cronometra una llamada a la API de Sheets (incluye errores)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.contar("sheets_errores_total", metodo=metodo, codigo=str(getattr(e, "code", type(e).__name__)))
+            raise
+        finally:
+            self.contar("sheets_llamadas_total", metodo=metodo)
+            self.observar("sheets_latencia_segundos", time.perf_counter() - inicio, metodo=metodo)
+
+    # -------------------------------------------------------
+    # Consultas y exportación
+    # -------------------------------------------------------
+    def resumen_histogramas(self, nombre, etiqueta):
+        """Tabla por etiqueta; p50/p95 son el límite superior del bucket correspondiente."""
+        with self._lock:
+            filas = [
+                {
+                    etiqueta: dict(etiquetas).get(etiqueta, ""),
+                    "llamadas": h.n,
+                    "total_s": round(h.suma, 3),
+                    "promedio_ms": round(h.suma / h.n * 1000, 1) if h.n else 0,
+                    "p50_ms": h.cuantil(0.5) * 1000,
+                    "p95_ms": h.cuantil(0.95) * 1000,
+                }
+                for (n, etiquetas), h in self.histogramas.items() if n == nombre
+            ]
+        return pd.DataFrame(filas)
+
+    def exportar_prometheus(self):
+        lineas = []
+        with self._lock:
+            for (nombre, etiquetas), valor in sorted(self.contadores.items()):
+                lineas.append(f"{nombre}{_etiquetas(etiquetas)} {valor}")
+            for (nombre, etiquetas), h in sorted(self.histogramas.items(), key=lambda x: x[0]):
+                acumulado = 0
+                for limite, conteo in zip(BUCKETS, h.conteos):
+                    acumulado += conteo
+                    lineas.append(f"{nombre}_bucket{_etiquetas(etiquetas + (('le', str(limite)),))} {acumulado}")
+                lineas.append(f"{nombre}_bucket{_etiquetas(etiquetas + (('le', '+Inf'),))} {h.n}")
+                lineas.append(f"{nombre}_sum{_etiquetas(etiquetas)} {h.suma:.6f}")
+                lineas.append(f"{nombre}_count{_etiquetas(etiquetas)} {h.n}")
+        return "\n".join(lineas) + "\n"
+
+
+def _etiquetas(etiquetas):
+    if not etiquetas:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in etiquetas) + "}"
+
+
+METRICAS = Metricas()
+
+
+# ===========================================================
+# TIEMPOS POR FASE DE CADA RERUN
+# ===========================================================
+class Rerun:
+    """Cronometra las fases de una ejecución del script y la registra como JSON."""
+
+    def __init__(self, metricas=METRICAS):
+        self.metricas = metricas
+        self.inicio = time.perf_counter()
+        self.fases = {}
+        self.etiquetas = {}
+
+    @contextmanager
+    def fase(self, nombre):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            duracion = time.perf_counter() - inicio
+            self.fases[nombre] = round(self.fases.get(nombre, 0) + duracion * 1000, 2)
+            self.metricas.observar("fase_segundos", duracion, fase=nombre)
+
+    def finalizar(self):
+        total = time.perf_counter() - self.inicio
+        self.metricas.observar("rerun_segundos", total, **self.etiquetas)
+        logger.info(json.dumps(
+            {"evento": "rerun", **self.etiquetas, "total_ms": round(total * 1000, 2), "fases_ms": self.fases},
+            ensure_ascii=False,
+        ))
+
+
+# ===========================================================
+# HANDLES DE GSPREAD INSTRUMENTADOS
+# ===========================================================
+class HandleInstrumentado:
+    """Envuelve un Spreadsheet/Worksheet y mide cada método que se invoque."""
+
+    def __init__(self, objeto, metricas=METRICAS):
+        self._objeto = objeto
+        self._metricas = metricas
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self._objeto, nombre)
+        if not callable(atributo):
+            return atributo
+
+        def llamada(*args, **kwargs):
+            with self._metricas.medir_llamada_sheets(nombre):
+                return atributo(*args, **kwargs)
+        return llamada
@@ -0,0 +1,213 @@
+import pandas as pd
+
+# ===========================================================
+# MODELO TIPADO DE EVALUACIONES
+# ===========================================================
+COL_NOMBRE = "Nombre(s) y Apellidos:"
+COL_AREA = "Área de Adscripción:"
+COL_NIVEL = "Nivel:"
+COL_PERIODO = "Periodo"
+
+COLUMNAS_FIJAS = [
+    "Nombre(s) y Apellidos:", "C.U.R.P.", "R.F.C.", "Superior Jerárquico:", "Área de Adscripción:",
+    "Puesto que desempeña:", "Nivel:", "Fecha del Nombramiento:", "Antigüedad en el Puesto:",
+    "Antigüedad en Gobierno:", "Principal Funcion 1", "Principal Funcion 2", "Principal Funcion 3",
+    "Meta 1 descripción", "Meta 2 descripción", "Meta 3 descripción", "Meta 1 prog", "Meta 2 prog", "Meta 3 prog"
+]
+
+# Descripción de los 4 niveles de cada factor de calidad (12 factores = 48 puntos posibles)
+DESCRIPCIONES = {
+    "CONOCIMIENTO DEL PUESTO": [
+        "1️⃣ Posee mínimos conocimientos del puesto que tiene asignado, lo que le impide cumplir con la oportunidad y calidad establecidas.",
+        "2️⃣ Posee conocimientos elementales del puesto, lo que provoca deficiencias en la oportunidad y calidad básicas establecidas.",
+        "3️⃣ Posee un regular conocimiento del puesto, lo que le permite prestar servicios con oportunidad y calidad básicas.",
+        "4️⃣ Posee amplios conocimientos del puesto que tiene asignado, lo que le permite prestar los servicios con oportunidad y calidad requeridas."
+    ],
+    "CRITERIO": [
+        "1️⃣ Propone soluciones irrelevantes a los problemas de trabajo que se le presentan.",
+        "2️⃣ Propone soluciones aceptables a los problemas de trabajo que se le presentan.",
+        "3️⃣ Propone soluciones adecuadas a los problemas de trabajo que se le presentan.",
+        "4️⃣ Propone soluciones óptimas a los problemas de trabajo que se le presentan."
+    ],
+    "CALIDAD DEL TRABAJO": [
+        "1️⃣ Realiza trabajos con alto índice de errores en su confiabilidad, exactitud y presentación.",
+        "2️⃣ Realiza trabajos regulares con algunos errores.",
+        "3️⃣ Realiza buenos trabajos y excepcionalmente comete errores.",
+        "4️⃣ Realiza trabajos excelentes sin errores en su confiabilidad, exactitud y presentación."
+    ],
+    "TÉCNICA Y ORGANIZACIÓN DEL TRABAJO": [
+        "1️⃣ Aplica en grado mínimo las técnicas y organización establecidas.",
+        "2️⃣ Aplica ocasionalmente las técnicas establecidas.",
+        "3️⃣ Aplica la mayoría de las veces las técnicas establecidas.",
+        "4️⃣ Aplica en grado óptimo las técnicas y organización establecidas."
+    ],
+    "NECESIDAD DE SUPERVISIÓN": [
+        "1️⃣ Requiere permanente supervisión para realizar las funciones asignadas.",
+        "2️⃣ Requiere ocasional supervisión para realizar las funciones asignadas.",
+        "3️⃣ Requiere mínima supervisión para realizar las funciones asignadas.",
+        "4️⃣ Requiere nula supervisión para realizar las funciones asignadas."
+    ],
+    "CAPACITACIÓN RECIBIDA": [
+        "1️⃣ Aplica mínimamente los conocimientos adquiridos mediante la capacitación.",
+        "2️⃣ Aplica limitadamente los conocimientos adquiridos.",
+        "3️⃣ Aplica suficientemente los conocimientos adquiridos, elevando la eficiencia.",
+        "4️⃣ Aplica ampliamente los conocimientos adquiridos, elevando la eficiencia al máximo."
+    ],
+    "INICIATIVA": [
+        "1️⃣ Realiza nulas aportaciones para el mejoramiento del trabajo.",
+        "2️⃣ Realiza aportaciones irrelevantes para el mejoramiento.",
+        "3️⃣ Realiza aportaciones destacadas que mejoran calidad y tiempos.",
+        "4️⃣ Realiza aportaciones óptimas y continuas para el mejoramiento."
+    ],
+    "COLABORACIÓN Y DISCRECIÓN": [
+        "1️⃣ Muestra nula disposición para colaborar y provoca conflictos.",
+        "2️⃣ Muestra regular disposición y comete indiscreciones involuntarias.",
+        "3️⃣ Muestra buena disposición y prudencia en el manejo de información.",
+        "4️⃣ Muestra notable disposición y utiliza positivamente la información."
+    ],
+    "RESPONSABILIDAD Y DISCIPLINA": [
+        "1️⃣ Cumple mínimamente con las metas y evade disposiciones.",
+        "2️⃣ Cumple ocasionalmente con las metas y objeta disposiciones.",
+        "3️⃣ Cumple la mayoría de las veces con las metas y disposiciones.",
+        "4️⃣ Cumple invariablemente con metas institucionales y disposiciones."
+    ],
+    "TRABAJO EN EQUIPO": [
+        "1️⃣ Manifiesta nula disposición y entorpece el trabajo del equipo.",
+        "2️⃣ Manifiesta regular disposición y ocasionalmente interfiere.",
+        "3️⃣ Manifiesta buena disposición, contribuyendo al equipo.",
+        "4️⃣ Manifiesta notable disposición, siendo un elemento clave del equipo."
+    ],
+    "RELACIONES INTERPERSONALES": [
+        "1️⃣ Mantiene nulo grado de interacción con jefes, compañeros y público.",
+        "2️⃣ Mantiene regular grado de interacción con jefes, compañeros y público.",
+        "3️⃣ Mantiene buen grado de interacción con jefes, compañeros y público.",
+        "4️⃣ Mantiene excelente grado de interacción con jefes, compañeros y público."
+    ],
+    "MEJORA CONTINUA": [
+        "1️⃣ Demuestra mínimo compromiso para identificar áreas de oportunidad.",
+        "2️⃣ Demuestra regular compromiso para proponer mejoras.",
+        "3️⃣ Demuestra alto compromiso para identificar y proponer mejoras.",
+        "4️⃣ Demuestra amplio compromiso para mejorar continuamente su desempeño."
+    ]
+}
+
+FACTORES = tuple(DESCRIPCIONES)
+PUNTAJE_MAXIMO = 4 * len(FACTORES)     # 12 factores = 48 puntos posibles
+
+# Encabezado completo de la hoja (A:AP): columnas fijas + captura de la evaluación
+ENCABEZADOS_EVALUACION = COLUMNAS_FIJAS + [
+    "Día", "Mes", "Año", "Meta 1 real", "Meta 2 real", "Meta 3 real",
+    "Resultado 1", "Resultado 2", "Resultado 3",
+] + list(FACTORES) + ["Puntaje total", "Comentarios"]
+
+# Tooltip HTML de cada factor (se arma una sola vez al importar el módulo)
+TOOLTIPS = {
+    factor: f"<div class='tooltip'>ⓘ<div class='tooltiptext'><b>{factor}</b><br><br>{'<br>'.join(niveles)}</div></div>"
+    for factor, niveles in DESCRIPCIONES.items()
+}
+
+
+def resolver_columnas(columnas):
+    """Busca las columnas clave con tolerancia de nombres (una sola vez por carga)."""
+    columnas = list(columnas)
+    factores = {}
+    for factor in FACTORES:
+        col = next((c for c in columnas if factor in c.upper()), None)
+        if col:
+            factores[factor] = col
+    return {
+        "puntaje": next((c for c in columnas if "Puntaje" in c), None),
+        "mes": next((c for c in columnas if "Mes" in c), None),
+        "anio": next((c for c in columnas if "Año" in c or "Anio" in c), None),
+        "factores": factores,
+    }
+
+
+# ===========================================================
+# PROYECCIONES DE COLUMNAS POR MODO
+# ===========================================================
+# Cada función recibe el encabezado real de la hoja y devuelve los nombres de
+# las columnas que necesita el modo; el cargador solo descarga esas columnas.
+def columnas_plantilla(encabezados):
+    """Datos personales y metas programadas (modo RH e importación masiva)."""
+    return COLUMNAS_FIJAS
+
+
+def columnas_puntajes(encabezados):
+    """Lo que usa el panel administrativo: identificación, periodo, factores y puntaje."""
+    columnas = resolver_columnas(encabezados)
+    return [
+        COL_NOMBRE, COL_AREA, "Puesto que desempeña:", COL_NIVEL,
+        columnas["mes"], columnas["anio"], *columnas["factores"].values(), columnas["puntaje"],
+    ]
+
+
+def normalizar(df):
+    """Devuelve una copia tipada del DataFrame crudo de la hoja.
+
+    - Área, nombre y nivel como categóricas.
+    - Puntaje y factores como float32; Mes y Año como enteros con nulos.
+    - ``Periodo`` como columna ``period[M]`` construida de forma vectorizada.
+    - El mapeo de columnas clave queda en ``df.attrs["columnas"]``.
+    """
+    df = df.copy()
+    if df.columns.empty:  # Hoja vacía: nada que tipar
+        df.attrs["columnas"] = resolver_columnas([])
+        return df
+    df.columns = df.columns.str.strip()  # Elimina espacios finales en los encabezados
+    columnas = resolver_columnas(df.columns)
+
+    for col in (COL_AREA, COL_NOMBRE, COL_NIVEL):
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+
+    numericas = [columnas["puntaje"], *columnas["factores"].values()]
+    for col in filter(None, numericas):
+        df[col] = pd.to_numeric(df[col], errors="coerce").astype("float32")
+
+    for col in filter(None, (columnas["mes"], columnas["anio"])):
+        df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int16")
+
+    if columnas["mes"] and columnas["anio"]:
+        fechas = pd.to_datetime(
+            pd.DataFrame({
+                "year": df[columnas["anio"]].astype("float64"),
+                "month": df[columnas["mes"]].astype("float64"),
+                "day": 1,
+            }),
+            errors="coerce",
+        )
+        df[COL_PERIODO] = fechas.dt.to_period("M")
+
+    df.attrs["columnas"] = columnas
+    return df
+
+
+def normalizar_incremental(crudo, previo=None):
+    """Como ``normalizar``, pero reutiliza el frame tipado del refresco anterior.
+
+    Mientras la generación no cambie la hoja solo crece, así que basta tipar
+    las filas nuevas y anexarlas. Las categóricas se unen con las categorías
+    ordenadas, igual que ``astype("category")``, para que ordenar por código
+    siga siendo alfabético. Si cambió la generación o hay menos filas, se tipa todo.
+    """
+    if (previo is None or not len(previo)
+            or previo.attrs.get("generacion") != crudo.attrs.get("generacion")
+            or len(crudo) < len(previo)):
+        return normalizar(crudo)
+    if len(crudo) == len(previo):
+        return previo
+
+    cola = normalizar(crudo.iloc[len(previo):])
+    df = pd.concat([previo, cola], ignore_index=True)
+    for col in previo.columns:
+        if isinstance(previo[col].dtype, pd.CategoricalDtype):
+            df[col] = pd.api.types.union_categoricals([previo[col].array, cola[col].array], sort_categories=True)
+    df.attrs = {**crudo.attrs, "columnas": previo.attrs["columnas"]}
+    return df
+
+
+def etiqueta_periodo(periodos):
+    """Convierte una serie ``period[M]`` en etiquetas "Mes/Año" para las gráficas."""
+    etiquetas = periodos.dt.month.astype(str) + "/" + periodos.dt.year.astype(str)
+    return etiquetas.where(periodos.notna(), "")
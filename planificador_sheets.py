@@ -0,0 +1,159 @@
+import logging
+import random
+import time
+from threading import Event, Lock
+
+from gspread.exceptions import APIError
+
+from metricas import METRICAS
+
+logger = logging.getLogger(__name__)
+
+CUOTA_LECTURA_MIN = 60      # Cuota de la API de Sheets por usuario y minuto
+CUOTA_ESCRITURA_MIN = 60
+CODIGOS_REINTENTABLES = {429, 500, 502, 503, 504}
+# Las escrituras solo se reintentan aquí ante 429, que garantiza que no se
+# escribió nada. Una escritura que respondió 5xx pudo haberse aplicado: decidir
+# si reenviarla le toca a quien la pidió (ColaEscritura, importación masiva),
+# que la reenvía. La entrega es "al menos una vez": un 5xx puede dejar filas
+# duplicadas en la hoja; este módulo no lo evita.
+CODIGOS_REINTENTABLES_ESCRITURA = {429}
+
+# Métodos de gspread que consumen cuota de escritura; el resto cuenta como lectura
+ESCRITURAS = {
+    "values_append", "append_row", "append_rows", "update", "batch_update",
+    "values_update", "values_batch_update", "values_clear", "clear",
+}
+
+
+# ===========================================================
+# CUBETA DE TOKENS
+# ===========================================================
+class CubetaTokens:
+    """Permite ``cuota_min`` llamadas por minuto, con ráfagas de hasta ``cuota_min`` (0 = sin límite)."""
+
+    def __init__(self, cuota_min):
+        self.capacidad = float(cuota_min)
+        self.tasa = cuota_min / 60.0          # Tokens por segundo
+        self.tokens = self.capacidad
+        self.actualizado = time.monotonic()
+        self._lock = Lock()
+
+    def tomar(self):
+        """Bloquea hasta obtener un token; devuelve los segundos esperados."""
+        esperado = 0.0
+        if not self.tasa:
+            return esperado
+        while True:
+            with self._lock:
+                ahora = time.monotonic()
+                self.tokens = min(self.capacidad, self.tokens + (ahora - self.actualizado) * self.tasa)
+                self.actualizado = ahora
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return esperado
+                espera = (1 - self.tokens) / self.tasa
+            time.sleep(espera)
+            esperado += espera
+
+
+class _Vuelo:
+    """Lectura en curso que otras sesiones pueden esperar en lugar de repetirla."""
+
+    def __init__(self):
+        self.listo = Event()
+        self.resultado = None
+        self.error = None
+
+
+# ===========================================================
+# PLANIFICADOR
+# ===========================================================
+class PlanificadorSheets:
+    """Punto único por el que pasan todas las llamadas a Google Sheets.
+
+    - Presupuesta tokens contra las cuotas por minuto de lectura y escritura.
+    - Une lecturas idénticas concurrentes: si varias sesiones piden lo mismo a
+      la vez, solo una llega a la API y las demás reciben su resultado.
+    - Reintenta 429 y errores 5xx con espera exponencial con jitter completo;
+      las escrituras solo ante 429 (ver ``CODIGOS_REINTENTABLES_ESCRITURA``).
+    """
+
+    def __init__(self, cuota_lectura_min=CUOTA_LECTURA_MIN, cuota_escritura_min=CUOTA_ESCRITURA_MIN,
+                 max_reintentos=5, espera_base=1.0, espera_max=32.0):
+        self.cubetas = {
+            "lectura": CubetaTokens(cuota_lectura_min),
+            "escritura": CubetaTokens(cuota_escritura_min),
+        }
+        self.max_reintentos = max_reintentos
+        self.espera_base = espera_base
+        self.espera_max = espera_max
+        self._en_vuelo = {}
+        self._lock = Lock()
+
+    def ejecutar(self, metodo, funcion, *args, clave=None, **kwargs):
+        """Ejecuta ``funcion(*args, **kwargs)`` respetando cuota y reintentos.
+
+        ``clave`` identifica lecturas equivalentes que pueden unirse.
+        """
+        tipo = "escritura" if metodo in ESCRITURAS else "lectura"
+        if tipo == "escritura" or clave is None:
+            return self._con_reintentos(metodo, tipo, funcion, args, kwargs)
+
+        with self._lock:
+            vuelo = self._en_vuelo.get(clave)
+            propio = vuelo is None
+            if propio:
+                vuelo = self._en_vuelo[clave] = _Vuelo()
+
+        if not propio:
+            METRICAS.contar("sheets_lecturas_unidas_total", metodo=metodo)
+            vuelo.listo.wait()
+            if vuelo.error is not None:
+                raise vuelo.error
+            return vuelo.resultado
+
+        try:
+            vuelo.resultado = self._con_reintentos(metodo, tipo, funcion, args, kwargs)
+            return vuelo.resultado
+        except Exception as e:
+            vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_vuelo[clave]
+            vuelo.listo.set()
+
+    def _con_reintentos(self, metodo, tipo, funcion, args, kwargs):
+        reintentables = CODIGOS_REINTENTABLES_ESCRITURA if tipo == "escritura" else CODIGOS_REINTENTABLES
+        for intento in range(self.max_reintentos + 1):
+            esperado = self.cubetas[tipo].tomar()
+            if esperado:
+                METRICAS.observar("sheets_espera_cuota_segundos", esperado, tipo=tipo)
+            try:
+                return funcion(*args, **kwargs)
+            except APIError as e:
+                if getattr(e, "code", None) not in reintentables or intento == self.max_reintentos:
+                    raise
+                espera = random.uniform(0, min(self.espera_max, self.espera_base * 2 ** intento))
+                METRICAS.contar("sheets_reintentos_total", metodo=metodo, codigo=str(e.code))
+                logger.warning("Sheets respondió %s en %s; reintento %d en %.1f s.", e.code, metodo, intento + 1, espera)
+                time.sleep(espera)
+
+
+class HandlePlanificado:
+    """Envuelve un Spreadsheet/Worksheet para que sus métodos pasen por el planificador."""
+
+    def __init__(self, objeto, planificador):
+        self._objeto = objeto
+        self._planificador = planificador
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self._objeto, nombre)
+        if not callable(atributo):
+            return atributo
+
+        def llamada(*args, **kwargs):
+            clave = (id(self._objeto), nombre, repr(args), repr(sorted(kwargs.items())))
+            return self._planificador.ejecutar(nombre, atributo, *args, clave=clave, **kwargs)
+        return llamada
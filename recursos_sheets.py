@@ -0,0 +1,105 @@
+import logging
+from threading import Lock
+
+import gspread
+from requests.adapters import HTTPAdapter
+
+from metricas import METRICAS, HandleInstrumentado
+from planificador_sheets import HandlePlanificado, PlanificadorSheets
+
+logger = logging.getLogger(__name__)
+
+
+# ===========================================================
+# RECURSOS COMPARTIDOS DE GOOGLE SHEETS
+# ===========================================================
+class RecursosSheets:
+    """Cliente autorizado, pool HTTP, worksheets y encabezados en caché.
+
+    Se crea una sola vez por proceso (``st.cache_resource``), de modo que
+    ``open_by_key``, ``worksheet`` y ``row_values(1)`` no se repiten en cada
+    guardado. El encabezado no se vuelve a pedir: el cargador lo lee en cada
+    refresco y lo publica con ``actualizar_encabezados``. Todos los
+    handles se entregan instrumentados (contador y latencia por método) y sus
+    llamadas pasan por el ``PlanificadorSheets`` (cuotas, uniones y reintentos).
+    """
+
+    def __init__(self, creds, sheet_id, tam_pool=10, client=None, planificador=None):
+        self.sheet_id = sheet_id
+        self.client = client or gspread.authorize(creds)  # client: p. ej. sheets_falso.ClienteFalso
+        self.planificador = planificador or PlanificadorSheets()
+        self._montar_pool(tam_pool)
+
+        self._spreadsheet = None
+        self._hojas = {}
+        self._encabezados = {}
+        self._lock = Lock()                 # Protege los diccionarios; nunca se llama a la API con él
+        self._apertura = Lock()             # Serializa open_by_key/worksheet (pueden esperar cuota)
+
+    def _montar_pool(self, tam_pool):
+        # gspread >= 6 expone la sesión en http_client; versiones previas en client.session
+        http_client = getattr(self.client, "http_client", self.client)
+        session = getattr(http_client, "session", None)
+        if session is not None:
+            adaptador = HTTPAdapter(pool_connections=tam_pool, pool_maxsize=tam_pool)
+            session.mount("https://", adaptador)
+
+    # -------------------------------------------------------
+    # Handles
+    # -------------------------------------------------------
+    def _envolver(self, objeto):
+        """Cada llamada pasa por el planificador (cuota y reintentos) y se mide."""
+        return HandlePlanificado(HandleInstrumentado(objeto), self.planificador)
+
+    def _abrir(self):
+        with METRICAS.medir_llamada_sheets("open_by_key"):
+            return self.client.open_by_key(self.sheet_id)
+
+    def spreadsheet(self):
+        with self._lock:
+            if self._spreadsheet is not None:
+                return self._spreadsheet
+        with self._apertura:
+            if self._spreadsheet is None:
+                spreadsheet = self._envolver(self.planificador.ejecutar("open_by_key", self._abrir))
+                with self._lock:
+                    self._spreadsheet = spreadsheet
+            return self._spreadsheet
+
+    def hoja(self, nombre):
+        with self._lock:
+            if nombre in self._hojas:
+                return self._hojas[nombre]
+        spreadsheet = self.spreadsheet()
+        with self._apertura:
+            if nombre not in self._hojas:
+                hoja = self._envolver(spreadsheet.worksheet(nombre))
+                with self._lock:
+                    self._hojas[nombre] = hoja
+            return self._hojas[nombre]
+
+    # -------------------------------------------------------
+    # Encabezados
+    # -------------------------------------------------------
+    def encabezados(self, nombre):
+        """Encabezado de la hoja; solo consulta la API si no está en caché."""
+        with self._lock:
+            encabezados = self._encabezados.get(nombre)
+        if encabezados is None:
+            encabezados = self.hoja(nombre).row_values(1)
+            self.actualizar_encabezados(nombre, encabezados)
+        return encabezados
+
+    def encabezados_en_cache(self, nombre):
+        """Encabezado ya conocido o ``None``, sin llamar a la API."""
+        with self._lock:
+            return self._encabezados.get(nombre)
+
+    def actualizar_encabezados(self, nombre, encabezados):
+        """Registra el encabezado leído por otra vía (p. ej. el cargador de datos)."""
+        encabezados = list(encabezados)
+        with self._lock:
+            anterior = self._encabezados.get(nombre)
+            self._encabezados[nombre] = encabezados
+        if anterior is not None and anterior != encabezados:
+            logger.info("El encabezado de '%s' cambió (%d columnas).", nombre, len(encabezados))
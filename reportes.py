@@ -0,0 +1,245 @@
+import html
+import multiprocessing
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import groupby
+
+import pandas as pd
+
+from modelo_evaluaciones import (
+    COL_AREA, COL_NIVEL, COL_NOMBRE, COL_PERIODO, FACTORES, PUNTAJE_MAXIMO, etiqueta_periodo,
+)
+
+COL_PUESTO = "Puesto que desempeña:"
+TAMANO_LOTE = 50                        # Reportes por tarea enviada al pool
+
+ESTILO = """
+body { font-family: Arial, sans-serif; margin: 32px; color: #222; }
+h1 { font-size: 22px; margin-bottom: 4px; } h2 { font-size: 16px; margin-top: 28px; }
+table { border-collapse: collapse; font-size: 13px; } td, th { border: 1px solid #ccc; padding: 4px 8px; }
+th { background: #f0f3f8; text-align: left; } .dato { color: #555; font-size: 13px; }
+@media print { body { margin: 12mm; } }
+"""
+
+
+# ===========================================================
+# GRÁFICAS ESTÁTICAS EN SVG (SIN DEPENDENCIAS)
+# ===========================================================
+def _svg_barras(etiquetas, valores, maximo, ancho=520, alto_barra=18):
+    """Barras horizontales con la etiqueta a la izquierda y el valor al final."""
+    alto = alto_barra * len(valores) + 10
+    partes = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{ancho + 320}" height="{alto}" font-size="11">']
+    for i, (etiqueta, valor) in enumerate(zip(etiquetas, valores)):
+        y = 5 + i * alto_barra
+        largo = 0 if pd.isna(valor) else ancho * valor / maximo
+        partes.append(f'<text x="0" y="{y + 12}">{html.escape(str(etiqueta))}</text>')
+        partes.append(f'<rect x="300" y="{y + 2}" width="{largo:.1f}" height="{alto_barra - 5}" fill="#2c7be5"/>')
+        partes.append(f'<text x="{306 + largo:.1f}" y="{y + 12}">{"" if pd.isna(valor) else f"{valor:.2f}"}</text>')
+    partes.append("</svg>")
+    return "".join(partes)
+
+
+def _svg_linea(etiquetas, valores, maximo, ancho=640, alto=220):
+    """Línea de evolución con un punto por periodo y eje Y de 0 a ``maximo``."""
+    if not valores:
+        return "<p class='dato'>Sin evaluaciones con periodo.</p>"
+    margen, paso = 40, (ancho - 60) / max(len(valores) - 1, 1)
+    puntos = [(margen + i * paso, alto - 30 - (alto - 50) * v / maximo) for i, v in enumerate(valores)]
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{ancho}" height="{alto}" font-size="11">',
+        f'<line x1="{margen}" y1="{alto - 30}" x2="{ancho - 10}" y2="{alto - 30}" stroke="#999"/>',
+        f'<line x1="{margen}" y1="20" x2="{margen}" y2="{alto - 30}" stroke="#999"/>',
+        f'<text x="4" y="24">{maximo}</text><text x="4" y="{alto - 30}">0</text>',
+        '<polyline fill="none" stroke="#2c7be5" stroke-width="2" points="'
+        + " ".join(f"{x:.1f},{y:.1f}" for x, y in puntos) + '"/>',
+    ]
+    for (x, y), etiqueta, valor in zip(puntos, etiquetas, valores):
+        partes.append(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="3" fill="#2c7be5"/>')
+        partes.append(f'<text x="{x - 14:.1f}" y="{alto - 14}">{html.escape(etiqueta)}</text>')
+        partes.append(f'<text x="{x - 8:.1f}" y="{y - 6:.1f}">{valor:.1f}</text>')
+    partes.append("</svg>")
+    return "".join(partes)
+
+
+# ===========================================================
+# PLANTILLAS HTML
+# ===========================================================
+def _pagina(titulo, cuerpo):
+    return (
+        f"<!DOCTYPE html><html lang='es'><head><meta charset='utf-8'><title>{html.escape(titulo)}</title>"
+        f"<style>{ESTILO}</style></head><body>{cuerpo}</body></html>"
+    )
+
+
+def _tabla(encabezados, filas):
+    cabecera = "".join(f"<th>{html.escape(str(e))}</th>" for e in encabezados)
+    cuerpo = "".join("<tr>" + "".join(f"<td>{html.escape(str(c))}</td>" for c in fila) + "</tr>" for fila in filas)
+    return f"<table><tr>{cabecera}</tr>{cuerpo}</table>"
+
+
+def html_trabajador(datos):
+    """Reporte individual: datos del puesto, evolución del puntaje y promedio por factor."""
+    evaluaciones = datos["evaluaciones"]
+    cuerpo = (
+        f"<h1>Evaluación del desempeño: {html.escape(datos['nombre'])}</h1>"
+        f"<p class='dato'>Área: {html.escape(datos['area'])} · Puesto: {html.escape(datos['puesto'])}"
+        f" · Nivel: {html.escape(datos['nivel'])}</p>"
+        f"<p><b>Promedio:</b> {datos['promedio']:.2f}/{PUNTAJE_MAXIMO} · "
+        f"<b>Evaluaciones:</b> {len(evaluaciones)}</p>"
+        "<h2>Evolución del puntaje por periodo</h2>"
+        + _svg_linea(datos["periodos"], datos["promedios_periodo"], PUNTAJE_MAXIMO)
+        + "<h2>Promedio por factor de calidad (1 a 4)</h2>"
+        + _svg_barras(FACTORES, [datos["factores"].get(f) for f in FACTORES], 4)
+        + "<h2>Evaluaciones registradas</h2>"
+        + _tabla(["Periodo", "Puntaje total"], evaluaciones)
+    )
+    return _pagina(datos["nombre"], cuerpo)
+
+
+def html_area(datos):
+    """Resumen por área: indicadores, evolución mensual y ranking de trabajadores."""
+    cuerpo = (
+        f"<h1>Resumen del área: {html.escape(datos['area'])}</h1>"
+        f"<p><b>Trabajadores:</b> {len(datos['trabajadores'])} · <b>Evaluaciones:</b> {datos['n']} · "
+        f"<b>Promedio:</b> {datos['promedio']:.2f}/{PUNTAJE_MAXIMO} · <b>Mediana:</b> {datos['mediana']:.2f} · "
+        f"<b>Rango:</b> {datos['min']:.0f}–{datos['max']:.0f}</p>"
+        "<h2>Promedio del área por periodo</h2>"
+        + _svg_linea(datos["periodos"], datos["promedios_periodo"], PUNTAJE_MAXIMO)
+        + "<h2>Promedio por factor de calidad (1 a 4)</h2>"
+        + _svg_barras(FACTORES, [datos["factores"].get(f) for f in FACTORES], 4)
+        + "<h2>Trabajadores (de mayor a menor promedio)</h2>"
+        + _tabla(["Trabajador", "Evaluaciones", "Promedio"], datos["trabajadores"])
+    )
+    return _pagina(datos["area"], cuerpo)
+
+
+def nombre_archivo(texto):
+    """Nombre seguro para usar dentro del ZIP."""
+    return re.sub(r"[^\w\-]+", "_", str(texto)).strip("_") or "sin_nombre"
+
+
+def renderizar_lote(tareas):
+    """Convierte un lote de tareas en ``(ruta en el ZIP, bytes)``; se ejecuta en el pool."""
+    documentos = []
+    for tipo, datos in tareas:
+        if tipo == "area":
+            ruta = f"areas/{nombre_archivo(datos['area'])}.html"
+            documentos.append((ruta, html_area(datos).encode("utf-8")))
+        else:
+            ruta = f"trabajadores/{nombre_archivo(datos['area'])}/{nombre_archivo(datos['nombre'])}.html"
+            documentos.append((ruta, html_trabajador(datos).encode("utf-8")))
+    return documentos
+
+
+# ===========================================================
+# PREPARACIÓN: UNA SOLA PASADA SOBRE EL FRAME
+# ===========================================================
+def _agrupar_listas(df, columnas):
+    """(área, trabajador) → lista de tuplas de ``columnas``; ``df`` viene ordenado por esa clave."""
+    claves = zip(df[COL_AREA].tolist(), df[COL_NOMBRE].tolist())
+    valores = zip(*(df[c].tolist() for c in columnas))
+    return {clave: [v for _, v in filas] for clave, filas in groupby(zip(claves, valores), key=lambda f: f[0])}
+
+
+def preparar_tareas(df):
+    """Divide el frame tipado por área y trabajador en tareas de datos simples.
+
+    Los agregados se calculan con ``groupby`` sobre el frame completo y las
+    tareas solo llevan listas y diccionarios, baratos de enviar a otro proceso.
+    """
+    columnas = df.attrs["columnas"]
+    col_puntaje, col_factores = columnas["puntaje"], columnas["factores"]
+    if not col_puntaje or COL_PERIODO not in df.columns:
+        return []
+
+    extras = [c for c in (COL_PUESTO, COL_NIVEL) if c in df.columns]
+    ev = df.loc[df[col_puntaje].notna(), [COL_AREA, COL_NOMBRE, COL_PERIODO, col_puntaje, *extras, *col_factores.values()]]
+    ev = ev.rename(columns={col_puntaje: "puntaje", **{col: f for f, col in col_factores.items()}})
+    ev[COL_AREA] = ev[COL_AREA].astype(str)
+    ev[COL_NOMBRE] = ev[COL_NOMBRE].astype(str)
+    ev = ev.sort_values([COL_AREA, COL_NOMBRE, COL_PERIODO], kind="stable", na_position="last")
+    ev["etiqueta"] = etiqueta_periodo(ev[COL_PERIODO])
+    factores = [f for f in FACTORES if f in ev.columns]
+
+    claves = [COL_AREA, COL_NOMBRE]
+    por_trabajador = ev.groupby(claves, sort=False).agg(
+        n=("puntaje", "size"), promedio=("puntaje", "mean"),
+        **{c: (c, "first") for c in extras}, **{f: (f, "mean") for f in factores},
+    )
+    por_periodo = ev[ev[COL_PERIODO].notna()].groupby(claves + [COL_PERIODO], sort=False).agg(
+        etiqueta=("etiqueta", "first"), promedio=("puntaje", "mean"),
+    )
+    periodos = _agrupar_listas(por_periodo.reset_index(), ["etiqueta", "promedio"])
+    evaluaciones = _agrupar_listas(ev.assign(puntaje=ev["puntaje"].astype(float).round(2)), ["etiqueta", "puntaje"])
+
+    tareas = []
+    for (area, nombre), fila in zip(por_trabajador.index, por_trabajador.to_dict("records")):
+        serie = periodos.get((area, nombre), [])
+        tareas.append(("trabajador", {
+            "area": area, "nombre": nombre,
+            "puesto": str(fila.get(COL_PUESTO, "")), "nivel": str(fila.get(COL_NIVEL, "")),
+            "promedio": float(fila["promedio"]),
+            "periodos": [etiqueta for etiqueta, _ in serie], "promedios_periodo": [float(v) for _, v in serie],
+            "factores": {f: float(fila[f]) for f in factores if pd.notna(fila[f])},
+            "evaluaciones": evaluaciones.get((area, nombre), []),
+        }))
+
+    for area, grupo in ev.groupby(COL_AREA, sort=True):
+        puntajes = grupo["puntaje"]
+        mensual = grupo[grupo[COL_PERIODO].notna()].groupby(COL_PERIODO).agg(
+            etiqueta=("etiqueta", "first"), promedio=("puntaje", "mean"))
+        ranking = por_trabajador.loc[area].sort_values("promedio", ascending=False)
+        tareas.append(("area", {
+            "area": area, "n": int(len(puntajes)), "promedio": float(puntajes.mean()),
+            "mediana": float(puntajes.median()), "min": float(puntajes.min()), "max": float(puntajes.max()),
+            "periodos": mensual["etiqueta"].tolist(), "promedios_periodo": mensual["promedio"].astype(float).tolist(),
+            "factores": {f: float(v) for f, v in grupo[factores].mean().items() if pd.notna(v)},
+            "trabajadores": [(n, int(f["n"]), round(float(f["promedio"]), 2)) for n, f in ranking.iterrows()],
+        }))
+    return tareas
+
+
+# ===========================================================
+# GENERACIÓN EN PARALELO HACIA UN ZIP
+# ===========================================================
+def generar_reportes(df, destino, procesos=None, tamano_lote=TAMANO_LOTE, al_avanzar=None):
+    """Escribe en ``destino`` (ruta o archivo binario) un ZIP con todos los reportes.
+
+    Las tareas se reparten en lotes entre ``procesos`` procesos (por defecto,
+    uno por núcleo; 1 = en este proceso) y cada lote se escribe en el ZIP en
+    cuanto termina, así la memoria no crece con el número de documentos.
+    ``al_avanzar(hechos, total)`` se llama tras cada lote. Devuelve cuántos
+    documentos se generaron.
+    """
+    tareas = preparar_tareas(df)
+    lotes = [tareas[i:i + tamano_lote] for i in range(0, len(tareas), tamano_lote)]
+    procesos = min(procesos or os.cpu_count() or 1, len(lotes) or 1)
+    hechos, indice = 0, []
+
+    with zipfile.ZipFile(destino, "w", zipfile.ZIP_DEFLATED) as archivo:
+        def guardar(documentos):
+            nonlocal hechos
+            for ruta, contenido in documentos:
+                archivo.writestr(ruta, contenido)
+                indice.append(ruta)
+            hechos += len(documentos)
+            if al_avanzar:
+                al_avanzar(hechos, len(tareas))
+
+        if procesos == 1:
+            for lote in lotes:
+                guardar(renderizar_lote(lote))
+        else:
+            # spawn: hacer fork de un servidor con hilos (Streamlit, cola, refrescos)
+            # puede heredar locks tomados y colgar al proceso hijo
+            contexto = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto) as pool:
+                for futuro in as_completed([pool.submit(renderizar_lote, lote) for lote in lotes]):
+                    guardar(futuro.result())
+
+        enlaces = "".join(f"<li><a href='{html.escape(r)}'>{html.escape(r)}</a></li>" for r in sorted(indice))
+        archivo.writestr("index.html", _pagina("Reportes", f"<h1>Reportes de evaluación</h1><ul>{enlaces}</ul>"))
+    return hechos
+
@@ -0,0 +1,134 @@
+import csv
+import json
+import re
+import time
+from collections import Counter, deque
+from threading import Lock
+
+import requests
+from gspread.exceptions import APIError
+
+from carga_incremental import indice_columna
+
+# ===========================================================
+# GOOGLE SHEETS FALSO (EN PROCESO, SIN RED)
+# ===========================================================
+# Imita la parte de gspread que usa la aplicación: open_by_key, worksheet,
+# get, batch_get, row_values y values_append. Simula la latencia de cada
+# llamada y las cuotas por minuto de lectura y escritura (responde 429 como
+# la API real), y cuenta las llamadas para pruebas y benchmarks.
+
+CUOTA_LECTURA_MIN = 60     # Cuota por usuario y minuto de la API de Sheets
+CUOTA_ESCRITURA_MIN = 60
+
+
+def error_cuota(tipo):
+    """APIError 429 con el mismo formato que devuelve Google."""
+    respuesta = requests.Response()
+    respuesta.status_code = 429
+    respuesta._content = json.dumps({"error": {
+        "code": 429,
+        "message": f"Quota exceeded for quota metric '{tipo} requests' (simulado).",
+        "status": "RESOURCE_EXHAUSTED",
+    }}).encode()
+    return APIError(respuesta)
+
+
+def _recortar(fila):
+    """Sheets omite las celdas vacías al final de cada fila."""
+    fila = list(fila)
+    while fila and fila[-1] == "":
+        fila.pop()
+    return fila
+
+
+class ClienteFalso:
+    """Cliente compatible con ``gspread.Client`` respaldado por listas en memoria."""
+
+    def __init__(self, hojas=None, latencia_lectura=0.0, latencia_escritura=0.0,
+                 cuota_lectura_min=CUOTA_LECTURA_MIN, cuota_escritura_min=CUOTA_ESCRITURA_MIN):
+        self.hojas = {nombre: [list(f) for f in filas] for nombre, filas in (hojas or {}).items()}
+        self.latencia = {"lectura": latencia_lectura, "escritura": latencia_escritura}
+        self.cuota = {"lectura": cuota_lectura_min, "escritura": cuota_escritura_min}
+        self.llamadas = Counter()
+        self._ventanas = {"lectura": deque(), "escritura": deque()}
+        self._lock = Lock()
+
+    @classmethod
+    def desde_csv(cls, ruta, hoja="trabajadores", **kwargs):
+        """Cliente con una hoja precargada desde un CSV (encabezado en la primera fila)."""
+        with open(ruta, newline="", encoding="utf-8") as f:
+            return cls({hoja: list(csv.reader(f))}, **kwargs)
+
+    def registrar(self, metodo, tipo):
+        """Cuenta la llamada, aplica la cuota por minuto y simula la latencia."""
+        ahora = time.monotonic()
+        with self._lock:
+            self.llamadas[metodo] += 1
+            ventana = self._ventanas[tipo]
+            while ventana and ahora - ventana[0] >= 60:
+                ventana.popleft()
+            if self.cuota[tipo] and len(ventana) >= self.cuota[tipo]:
+                self.llamadas["429"] += 1
+                raise error_cuota(tipo)
+            ventana.append(ahora)
+        if self.latencia[tipo]:
+            time.sleep(self.latencia[tipo])
+
+    def open_by_key(self, key):
+        self.registrar("open_by_key", "lectura")
+        return SpreadsheetFalso(self, key)
+
+
+class SpreadsheetFalso:
+    def __init__(self, cliente, key):
+        self.cliente = cliente
+        self.id = key
+
+    def worksheet(self, nombre):
+        self.cliente.registrar("worksheet", "lectura")
+        self.cliente.hojas.setdefault(nombre, [])
+        return HojaFalsa(self, nombre)
+
+    def values_append(self, rango, params=None, body=None):
+        self.cliente.registrar("values_append", "escritura")
+        nombre = rango.split("!")[0]
+        filas = [[str(celda) for celda in fila] for fila in (body or {}).get("values", [])]
+        with self.cliente._lock:
+            self.cliente.hojas.setdefault(nombre, []).extend(filas)
+        return {"updates": {"updatedRows": len(filas)}}
+
+
+class HojaFalsa:
+    def __init__(self, spreadsheet, nombre):
+        self.spreadsheet = spreadsheet
+        self.title = nombre
+
+    @property
+    def _filas(self):
+        return self.spreadsheet.cliente.hojas[self.title]
+
+    def _rango(self, rango):
+        m = re.fullmatch(r"([A-Z]+)(\d*):([A-Z]+)(\d*)", rango.split("!")[-1])
+        if not m:
+            raise ValueError(f"Rango no soportado por la hoja falsa: {rango}")
+        c0, c1 = indice_columna(m.group(1)), indice_columna(m.group(3)) + 1
+        f0 = int(m.group(2) or 1) - 1
+        f1 = int(m.group(4)) if m.group(4) else None
+        filas = [_recortar(fila[c0:c1]) for fila in self._filas[f0:f1]]
+        while filas and not filas[-1]:
+            filas.pop()
+        return filas
+
+    def get(self, rango=None, **kwargs):
+        self.spreadsheet.cliente.registrar("get", "lectura")
+        return self._rango(rango or "A:ZZ")
+
+    def batch_get(self, rangos, **kwargs):
+        self.spreadsheet.cliente.registrar("batch_get", "lectura")
+        return [self._rango(rango) for rango in rangos]
+
+    def row_values(self, fila):
+        self.spreadsheet.cliente.registrar("row_values", "lectura")
+        filas = self._filas
+        return _recortar(filas[fila - 1]) if fila <= len(filas) else []
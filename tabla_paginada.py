@@ -0,0 +1,52 @@
+import math
+
+import pandas as pd
+import streamlit as st
+
+TAMANOS_PAGINA = (25, 50, 100, 250)
+
+
+# ===========================================================
+# TABLA PAGINADA (PROYECCIÓN, BÚSQUEDA Y ORDEN EN SERVIDOR)
+# ===========================================================
+def buscar(df, texto, columnas):
+    """Filas donde alguna de ``columnas`` contiene ``texto`` (sin distinguir mayúsculas)."""
+    if not texto:
+        return df
+    mascara = pd.Series(False, index=df.index)
+    for col in columnas:
+        mascara |= df[col].astype(str).str.contains(texto, case=False, regex=False, na=False)
+    return df[mascara]
+
+
+def pagina(df, numero, tamano):
+    """Devuelve solo las filas de la página ``numero`` (empezando en 1)."""
+    inicio = (numero - 1) * tamano
+    return df.iloc[inicio:inicio + tamano]
+
+
+def mostrar_tabla_paginada(df, columnas_default, clave="tabla"):
+    """Muestra ``df`` por páginas; solo la página visible se serializa al navegador."""
+    columnas_default = [c for c in columnas_default if c in df.columns]
+    columnas = st.multiselect(
+        "Columnas visibles:", df.columns.tolist(), default=columnas_default, key=f"{clave}_columnas"
+    ) or columnas_default
+
+    c1, c2, c3, c4 = st.columns([3, 2, 1, 1])
+    texto = c1.text_input("Buscar:", key=f"{clave}_buscar")
+    orden = c2.selectbox("Ordenar por:", ["(sin orden)"] + columnas, key=f"{clave}_orden")
+    descendente = c3.toggle("Descendente", key=f"{clave}_desc")
+    tamano = c4.selectbox("Filas:", TAMANOS_PAGINA, key=f"{clave}_tamano")
+
+    vista = buscar(df, texto.strip(), columnas)
+    if orden != "(sin orden)":
+        vista = vista.sort_values(orden, ascending=not descendente, kind="stable", na_position="last")
+
+    total_paginas = max(math.ceil(len(vista) / tamano), 1)
+    if st.session_state.get(f"{clave}_pagina", 1) > total_paginas:
+        st.session_state[f"{clave}_pagina"] = total_paginas  # La búsqueda redujo el número de páginas
+    numero = st.number_input(
+        f"Página (de {total_paginas}):", min_value=1, max_value=total_paginas, key=f"{clave}_pagina"
+    )
+    st.dataframe(pagina(vista, numero, tamano)[columnas], use_container_width=True, hide_index=True)
+    st.caption(f"{len(vista)} registros · página {numero} de {total_paginas}")
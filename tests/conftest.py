@@ -0,0 +1,46 @@
+import json
+import os
+import sys
+
+import pytest
+import requests
+from gspread.exceptions import APIError
+
+# Los módulos de la aplicación viven en la raíz del repositorio
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modelo_evaluaciones import ENCABEZADOS_EVALUACION  # noqa: E402
+from sheets_falso import ClienteFalso  # noqa: E402
+
+
+def fila_evaluacion(n, area="Área 1"):
+    """Fila completa (A:AP) con valores distinguibles por ``n``."""
+    fila = [f"{c} {n}" for c in ENCABEZADOS_EVALUACION]
+    fila[0] = f"Trabajador {n}"
+    fila[4] = area
+    return fila
+
+
+def error_api(codigo, mensaje="simulado"):
+    """APIError con el código y el formato de respuesta de Google."""
+    respuesta = requests.Response()
+    respuesta.status_code = codigo
+    respuesta._content = json.dumps({"error": {"code": codigo, "message": mensaje, "status": "X"}}).encode()
+    return APIError(respuesta)
+
+
+@pytest.fixture(name="error_api")
+def _error_api():
+    return error_api
+
+
+@pytest.fixture(name="fila_evaluacion")
+def _fila_evaluacion():
+    return fila_evaluacion
+
+
+@pytest.fixture
+def cliente():
+    """Sheets falso sin cuotas ni latencia, con encabezado y tres evaluaciones."""
+    filas = [list(ENCABEZADOS_EVALUACION)] + [fila_evaluacion(n) for n in range(3)]
+    return ClienteFalso({"trabajadores": filas}, cuota_lectura_min=0, cuota_escritura_min=0)
@@ -0,0 +1,67 @@
+import pytest
+
+from almacenamiento import (
+    AlmacenamientoParquet, AlmacenamientoSheets, AlmacenamientoSQLite, ajustar_fila, crear_almacenamiento,
+)
+from modelo_evaluaciones import COL_NOMBRE, ENCABEZADOS_EVALUACION, columnas_puntajes
+from planificador_sheets import PlanificadorSheets
+from recursos_sheets import RecursosSheets
+
+
+@pytest.fixture(params=["sheets_falso", "sqlite", "parquet"])
+def almacenamiento(request, cliente, tmp_path):
+    if request.param == "sheets_falso":
+        recursos = RecursosSheets(None, "x", client=cliente, planificador=PlanificadorSheets(0, 0))
+        return AlmacenamientoSheets(recursos)
+    return crear_almacenamiento(request.param, ruta=str(tmp_path / "datos"))
+
+
+def test_ajustar_fila():
+    assert ajustar_fila(["a"], 3) == ["a", "", ""]
+    assert ajustar_fila(["a", "b", "c"], 2) == ["a", "b"]
+
+
+def test_motor_desconocido():
+    with pytest.raises(ValueError):
+        crear_almacenamiento("mongo")
+
+
+def test_agregar_y_cargar_incremental(almacenamiento, fila_evaluacion):
+    inicial = len(almacenamiento.cargar())
+    generacion = almacenamiento.cargar().attrs["generacion"]
+
+    almacenamiento.agregar_filas([fila_evaluacion(10), ["Corta"]])
+    df = almacenamiento.cargar()
+    assert len(df) == inicial + 2
+    assert list(df.columns) == ENCABEZADOS_EVALUACION
+    assert df[COL_NOMBRE].tolist()[-2:] == ["Trabajador 10", "Corta"]
+    assert (df.iloc[-1, 1:] == "").all()  # La fila corta se rellenó
+    assert df.attrs["generacion"] == generacion
+
+
+def test_proyeccion_conserva_generacion(almacenamiento, fila_evaluacion):
+    almacenamiento.agregar_filas([fila_evaluacion(10)])
+    completo = almacenamiento.cargar()
+    proyectado = almacenamiento.cargar(columnas_puntajes)
+    assert set(proyectado.columns) < set(completo.columns)
+    assert len(proyectado) == len(completo)
+    assert proyectado.attrs["generacion"] is not None
+
+
+def test_sheets_rellena_filas_al_ancho_del_encabezado(cliente):
+    recursos = RecursosSheets(None, "x", client=cliente, planificador=PlanificadorSheets(0, 0))
+    AlmacenamientoSheets(recursos).agregar_filas([["Corta"], ["x"] * 50])
+    assert [len(f) for f in cliente.hojas["trabajadores"][-2:]] == [len(ENCABEZADOS_EVALUACION)] * 2
+    assert cliente.llamadas["values_append"] == 1  # Un lote = una llamada
+
+
+def test_sqlite_sin_columna_de_nombre(tmp_path):
+    almacenamiento = AlmacenamientoSQLite(str(tmp_path / "otra.db"), encabezados=["A", "B"])
+    almacenamiento.agregar_filas([["1"], ["2", "3", "4"]])
+    assert almacenamiento.cargar().values.tolist() == [["1", ""], ["2", "3"]]
+
+
+def test_sqlite_y_parquet_persisten(tmp_path, fila_evaluacion):
+    for clase, ruta in ((AlmacenamientoSQLite, tmp_path / "e.db"), (AlmacenamientoParquet, tmp_path / "parquet")):
+        clase(str(ruta)).agregar_filas([fila_evaluacion(1)])
+        assert clase(str(ruta)).cargar()[COL_NOMBRE].tolist() == ["Trabajador 1"]
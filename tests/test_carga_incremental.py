@@ -0,0 +1,90 @@
+from carga_incremental import CargadorIncremental, indice_columna, letra_columna, rangos_contiguos
+from modelo_evaluaciones import COL_NOMBRE, ENCABEZADOS_EVALUACION, columnas_plantilla, columnas_puntajes
+from sheets_falso import ClienteFalso
+
+
+def _cargador(cliente, **kwargs):
+    return CargadorIncremental(lambda: cliente.open_by_key("x").worksheet("trabajadores"), **kwargs)
+
+
+def _agregar(cliente, filas):
+    cliente.open_by_key("x").values_append("trabajadores", body={"values": filas})
+
+
+def test_letras_y_rangos():
+    assert [letra_columna(i) for i in (0, 25, 26, 41)] == ["A", "Z", "AA", "AP"]
+    assert indice_columna("AP") == 41
+    assert rangos_contiguos([6, 0, 4, 5]) == [(0, 0), (4, 6)]
+
+
+def test_hoja_vacia_devuelve_frame_vacio():
+    cliente = ClienteFalso({"trabajadores": []}, cuota_lectura_min=0, cuota_escritura_min=0)
+    assert _cargador(cliente).cargar().empty
+
+
+def test_solo_descarga_filas_nuevas(cliente, fila_evaluacion):
+    cargador = _cargador(cliente)
+    df = cargador.cargar()
+    assert list(df.columns) == ENCABEZADOS_EVALUACION
+    assert len(df) == 3 and df.attrs["generacion"] == 1
+
+    _agregar(cliente, [fila_evaluacion(3), fila_evaluacion(4)])
+    df = cargador.cargar()
+    assert df[COL_NOMBRE].tolist()[-2:] == ["Trabajador 3", "Trabajador 4"]
+    assert len(df) == 5 and df.attrs["generacion"] == 1  # Misma generación: solo se anexó
+
+    # Sin cambios en la hoja: una sola llamada y el mismo frame
+    antes = cliente.llamadas["batch_get"]
+    assert cargador.cargar() is df
+    assert cliente.llamadas["batch_get"] == antes + 1
+
+
+def test_borrado_fuerza_recarga_completa(cliente, fila_evaluacion):
+    cargador = _cargador(cliente)
+    cargador.cargar()
+    del cliente.hojas["trabajadores"][3]  # Se borra la última fila conocida
+    _agregar(cliente, [fila_evaluacion(9)])
+
+    df = cargador.cargar()
+    assert df[COL_NOMBRE].tolist() == ["Trabajador 0", "Trabajador 1", "Trabajador 9"]
+    assert df.attrs["generacion"] == 2
+
+
+def test_cambio_de_encabezado_fuerza_recarga_completa(cliente):
+    cargador = _cargador(cliente)
+    cargador.cargar()
+    cliente.hojas["trabajadores"][0][-1] = "Observaciones"
+
+    df = cargador.cargar()
+    assert df.columns[-1] == "Observaciones"
+    assert df.attrs["generacion"] == 2
+
+
+def test_filas_cortas_se_rellenan(cliente):
+    cargador = _cargador(cliente)
+    cargador.cargar()
+    _agregar(cliente, [["Solo nombre"]])  # Sheets omite las celdas vacías finales
+
+    df = cargador.cargar()
+    assert df.shape == (4, len(ENCABEZADOS_EVALUACION))
+    assert df.iloc[-1, 0] == "Solo nombre" and (df.iloc[-1, 1:] == "").all()
+
+
+def test_proyeccion_lee_solo_sus_columnas(cliente, fila_evaluacion):
+    cargador = _cargador(cliente, proyeccion=columnas_puntajes, encabezados_esperados=ENCABEZADOS_EVALUACION)
+    df = cargador.cargar()
+    assert list(df.columns) == [c for c in ENCABEZADOS_EVALUACION if c in columnas_puntajes(ENCABEZADOS_EVALUACION)]
+    assert df[COL_NOMBRE].tolist() == ["Trabajador 0", "Trabajador 1", "Trabajador 2"]
+
+    _agregar(cliente, [fila_evaluacion(3)])
+    df = cargador.cargar()
+    assert len(df) == 4 and df.attrs["generacion"] == 1
+
+
+def test_proyeccion_corrige_encabezados_inesperados(cliente):
+    # El cargador asume otro orden de columnas: relee una vez con el encabezado real
+    esperados = list(reversed(ENCABEZADOS_EVALUACION))
+    cargador = _cargador(cliente, proyeccion=columnas_plantilla, encabezados_esperados=esperados)
+    df = cargador.cargar()
+    assert df[COL_NOMBRE].tolist() == ["Trabajador 0", "Trabajador 1", "Trabajador 2"]
+    assert df["C.U.R.P."].tolist() == ["C.U.R.P. 0", "C.U.R.P. 1", "C.U.R.P. 2"]
@@ -0,0 +1,100 @@
+import pytest
+
+from cola_escritura import MAX_RECHAZOS_POR_ENVIO, ColaEscritura, fila_invalida
+
+
+class EnvioFalso:
+    """Acepta lotes salvo los que contienen filas "mala" (400 que señala la fila)."""
+
+    def __init__(self, error_api):
+        self.error_api = error_api
+        self.enviadas = []
+        self.llamadas = 0
+        self.fallos = []            # Errores de solicitud a lanzar antes de aceptar
+
+    def __call__(self, filas):
+        self.llamadas += 1
+        if self.fallos:
+            raise self.error_api(self.fallos.pop(0))
+        if ["mala"] in filas:
+            raise self.error_api(400, f"Invalid values[{filas.index(['mala'])}][0]: struct_value {{}}")
+        self.enviadas.extend(filas)
+
+
+@pytest.fixture
+def envio(error_api):
+    return EnvioFalso(error_api)
+
+
+@pytest.fixture
+def cola(tmp_path, envio):
+    cola = ColaEscritura(str(tmp_path / "cola.db"), envio, tamano_lote=100, intervalo_seg=3600)
+    yield cola
+    cola.detener()
+
+
+def test_solo_un_400_que_senala_la_fila_es_de_fila(error_api):
+    assert fila_invalida(error_api(400, "Invalid values[3][1]: list_value"), 5) == 3
+    assert fila_invalida(error_api(400, "Invalid values[7][1]: list_value"), 5) is None
+    assert fila_invalida(error_api(400, "Unable to parse range: trabajadores"), 5) is None
+    for codigo in (401, 403, 404, 429, 503):
+        assert fila_invalida(error_api(codigo, "Invalid values[0][0]"), 5) is None
+    assert fila_invalida(ConnectionError(), 5) is None
+
+
+def test_vaciar_envia_en_orden(cola, envio):
+    for n in range(5):
+        cola.encolar([str(n)])
+    assert cola.pendientes() == 5
+    cola.vaciar()
+    assert envio.enviadas == [[str(n)] for n in range(5)]
+    assert cola.pendientes() == 0 and cola.ultimo_envio
+
+
+def test_error_transitorio_conserva_el_lote(cola, envio):
+    cola.encolar(["a"])
+    envio.fallos = [503]
+    assert not cola._enviar_lote()
+    assert cola.pendientes() == 1 and cola.ultimo_error
+    cola.vaciar()
+    assert envio.enviadas == [["a"]] and cola.ultimo_error is None
+
+
+def test_fila_rechazada_no_bloquea_la_cola(cola, envio):
+    for fila in (["a"], ["mala"], ["b"], ["c"]):
+        cola.encolar(fila)
+    cola.vaciar()
+    assert envio.enviadas == [["a"], ["b"], ["c"]]
+    assert cola.pendientes() == 0
+    assert [fila for fila, _ in cola.rechazadas()] == [["mala"]]
+
+    cola.reintentar_rechazadas()
+    assert cola.pendientes() == 1 and cola.rechazadas() == []
+
+
+def test_error_de_solicitud_detiene_el_vaciado(cola, envio):
+    envio.fallos = [403]
+    for n in range(99):  # Menos que tamano_lote: el hilo no envía por su cuenta
+        cola.encolar([str(n)])
+    cola.vaciar()
+    assert envio.llamadas == 1  # Sin dividir el lote ni apartar filas
+    assert cola.pendientes() == 99 and cola.rechazadas() == []
+    assert "403" in cola.ultimo_error
+
+
+def test_rechazos_por_envio_acotados(cola, envio):
+    for _ in range(MAX_RECHAZOS_POR_ENVIO + 3):
+        cola.encolar(["mala"])
+    assert not cola._enviar_lote()
+    assert len(cola.rechazadas()) == MAX_RECHAZOS_POR_ENVIO
+    assert cola.pendientes() == 3
+
+
+def test_diario_sobrevive_al_reinicio(tmp_path, envio):
+    ruta = str(tmp_path / "cola.db")
+    caida = ColaEscritura(ruta, lambda filas: 1 / 0, intervalo_seg=3600)
+    caida.encolar(["x"])
+    caida.detener()  # El envío falla: la fila queda en el diario
+    cola = ColaEscritura(ruta, envio, intervalo_seg=3600)
+    cola.detener()  # Al detenerse envía lo pendiente
+    assert envio.enviadas == [["x"]]
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from cubo_evaluaciones import TODOS, Celda, CuboEvaluaciones
+from modelo_evaluaciones import COL_AREA, COL_NOMBRE, ENCABEZADOS_EVALUACION, FACTORES, normalizar
+
+
+def _frame(filas, generacion=1):
+    """Frame tipado: (área, nombre, mes, factor) → fila de la hoja con puntaje = 12 × factor."""
+    crudo = pd.DataFrame(
+        [[nombre, "", "", "", area] + [""] * 14 + ["1", str(mes), "2025"] + ["0"] * 6
+         + [str(factor)] * len(FACTORES) + [str(factor * len(FACTORES)), ""]
+         for area, nombre, mes, factor in filas],
+        columns=ENCABEZADOS_EVALUACION,
+    )
+    crudo.attrs["generacion"] = generacion
+    return normalizar(crudo)
+
+
+FILAS = [("A", "Ana", 1, 4), ("A", "Beto", 1, 2), ("A", "Ana", 2, 3), ("B", "Caro", 1, 1), ("B", "Caro", 2, 2)]
+
+
+def test_cuantiles_iguales_a_numpy():
+    valores = [12, 12, 24, 30, 36, 48, 48]
+    celda = Celda()
+    celda.agregar({v: valores.count(v) for v in set(valores)}, np.zeros(len(FACTORES)), np.zeros(len(FACTORES)))
+    for q in (0, 0.25, 0.5, 0.75, 1):
+        assert celda.cuantil(q) == pytest.approx(np.quantile(valores, q))
+    assert celda.media == pytest.approx(np.mean(valores))
+    assert np.isnan(Celda().cuantil(0.5))
+
+
+def test_resumenes_por_filtro():
+    cubo = CuboEvaluaciones()
+    cubo.sincronizar(_frame(FILAS))
+    assert cubo.areas() == ["A", "B"]
+    assert cubo.nombres("A") == ["Ana", "Beto"] and cubo.nombres() == ["Ana", "Beto", "Caro"]
+    assert cubo.resumen().n == 5
+    assert cubo.resumen("A", "Ana").media == pytest.approx((48 + 36) / 2)
+    assert cubo.resumen(TODOS, "Caro").promedio_factores()[FACTORES[0]] == pytest.approx(1.5)
+    assert cubo.resumen("B", "Ana") is None
+    assert cubo.serie("A")[COL_NOMBRE].tolist() == ["Ana", "Beto", "Ana"]
+    assert cubo.cajas()[COL_AREA].tolist() == ["A", "B"]
+
+
+def test_ingesta_incremental_equivale_a_reconstruir():
+    incremental = CuboEvaluaciones()
+    incremental.sincronizar(_frame(FILAS[:2]))
+    serie = incremental.serie()
+    incremental.sincronizar(_frame(FILAS))  # Misma generación: solo las filas nuevas
+
+    completo = CuboEvaluaciones()
+    completo.sincronizar(_frame(FILAS))
+    assert incremental.filas_procesadas == 5
+    for filtro in [(TODOS, TODOS), ("A", TODOS), ("B", "Caro"), (TODOS, "Ana")]:
+        assert incremental.resumen(*filtro).hist == completo.resumen(*filtro).hist
+    assert len(serie) == 2 and len(incremental.serie()) == 5  # La serie en caché se invalidó
+
+
+def test_nueva_generacion_reinicia():
+    cubo = CuboEvaluaciones()
+    cubo.sincronizar(_frame(FILAS))
+    cubo.sincronizar(_frame([("C", "Dora", 3, 4)], generacion=2))
+    assert cubo.areas() == ["C"] and cubo.resumen().n == 1
+
+
+def test_resumen_es_una_copia():
+    cubo = CuboEvaluaciones()
+    cubo.sincronizar(_frame(FILAS[:1]))
+    resumen = cubo.resumen()
+    cubo.sincronizar(_frame(FILAS))
+    assert resumen.n == 1 and cubo.resumen().n == 5
@@ -0,0 +1,61 @@
+import io
+
+import pandas as pd
+import pytest
+
+from importacion_masiva import COLUMNAS_PLANTILLA, escribir_por_bloques, leer_archivo, preparar_filas
+from indice_plantilla import COL_CURP, IndicePlantilla
+from modelo_evaluaciones import COL_NOMBRE, ENCABEZADOS_EVALUACION, FACTORES
+
+
+@pytest.fixture
+def indice(fila_evaluacion):
+    filas = [fila_evaluacion(n) for n in range(3)]
+    filas[0][1] = "CURP0"
+    filas[1][1] = ""           # Trabajador sin CURP capturada
+    df = pd.DataFrame(filas, columns=ENCABEZADOS_EVALUACION)
+    df.attrs["generacion"] = 1
+    indice = IndicePlantilla()
+    indice.sincronizar(df)
+    return indice
+
+
+def _archivo(filas):
+    df = pd.DataFrame(filas, columns=COLUMNAS_PLANTILLA)
+    return leer_archivo(io.BytesIO(df.to_csv(index=False).encode("utf-8")))
+
+
+def test_curp_y_nombre_identifican_al_trabajador(indice):
+    factores = ["3"] * len(FACTORES)
+    df = _archivo([
+        [" curp0 ", "", "1", "", ""] + factores + ["ok"],
+        ["", "Trabajador 2", "", "", ""] + factores + [""],
+        ["", "Desconocido", "", "", ""] + factores + [""],
+        ["", "", "", "", ""] + factores + [""],  # CURP vacía no coincide con la plantilla sin CURP
+    ])
+    filas, rechazos = preparar_filas(df, indice)
+    nombres = [fila[ENCABEZADOS_EVALUACION.index(COL_NOMBRE)] for fila in filas]
+    assert nombres == ["Trabajador 0", "Trabajador 2"]
+    assert filas[0][-2:] == [str(3 * len(FACTORES)), "ok"]
+    assert rechazos["Fila"].tolist() == [4, 5]
+
+
+def test_columnas_faltantes():
+    with pytest.raises(ValueError):
+        preparar_filas(pd.DataFrame({COL_CURP: ["X"]}), IndicePlantilla())
+
+
+def test_escritura_reanuda_desde_el_avance():
+    hoja, avance, fallos = [], [], [RuntimeError("429")]
+
+    def agregar(bloque):
+        if len(hoja) == 4 and fallos:
+            raise fallos.pop()
+        hoja.extend(bloque)
+
+    filas = list(range(10))
+    with pytest.raises(RuntimeError):
+        escribir_por_bloques(agregar, filas, tamano_bloque=2, al_avanzar=lambda hechas, total: avance.append(hechas))
+    assert avance == [2, 4]
+    assert escribir_por_bloques(agregar, filas, tamano_bloque=2, desde=avance[-1]) == 10
+    assert hoja == filas
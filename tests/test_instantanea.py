@@ -0,0 +1,102 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from instantanea import InstantaneaDatos
+from metricas import METRICAS
+
+
+class FuenteFalsa:
+    """Devuelve un frame crudo distinto en cada carga (o falla si se pide)."""
+
+    def __init__(self):
+        self.cargas = 0
+        self.fallar = False
+
+    def __call__(self):
+        if self.fallar:
+            raise RuntimeError("Sheets caído")
+        self.cargas += 1
+        df = pd.DataFrame({"n": [str(i) for i in range(self.cargas)]})
+        df.attrs["generacion"] = 1
+        return df
+
+
+def _esperar_refresco(instantanea):
+    limite = time.time() + 5
+    while instantanea.actualizando() and time.time() < limite:
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def fuente():
+    return FuenteFalsa()
+
+
+@pytest.fixture
+def ruta(tmp_path):
+    return str(tmp_path / "instantanea.parquet")
+
+
+def _lecturas(resultado):
+    return METRICAS.valor("instantanea_lecturas_total", resultado=resultado)
+
+
+def test_primera_carga_sincrona_y_luego_fresca(ruta, fuente):
+    instantanea = InstantaneaDatos(ruta, fuente, max_edad_seg=60)
+    sincronas, frescas = _lecturas("sincrona"), _lecturas("fresca")
+    assert len(instantanea.obtener()) == 1
+    assert len(instantanea.obtener()) == 1 and fuente.cargas == 1
+    assert _lecturas("sincrona") == sincronas + 1 and _lecturas("fresca") == frescas + 1
+    assert os.path.exists(ruta) and instantanea.edad() < 5
+
+
+def test_datos_vencidos_se_sirven_mientras_se_refrescan(ruta, fuente):
+    instantanea = InstantaneaDatos(ruta, fuente, max_edad_seg=0)
+    instantanea.obtener()
+    vencidas = _lecturas("vencida")
+    time.sleep(0.01)
+    assert len(instantanea.obtener()) == 1  # Se sirve lo anterior sin esperar
+    _esperar_refresco(instantanea)
+    assert _lecturas("vencida") == vencidas + 1
+    assert fuente.cargas == 2 and len(instantanea.df) == 2
+
+
+def test_invalidar_conserva_la_edad(ruta, fuente):
+    instantanea = InstantaneaDatos(ruta, fuente, max_edad_seg=60)
+    instantanea.obtener()
+    instantanea.invalidar()
+    assert instantanea.edad() < 5
+    instantanea.obtener()
+    _esperar_refresco(instantanea)
+    assert fuente.cargas == 2 and not instantanea.vencida
+
+
+def test_error_de_refresco_conserva_los_datos(ruta, fuente):
+    instantanea = InstantaneaDatos(ruta, fuente, max_edad_seg=60)
+    instantanea.obtener()
+    fuente.fallar = True
+    instantanea.invalidar()
+    instantanea.obtener()
+    _esperar_refresco(instantanea)
+    assert "Sheets caído" in instantanea.ultimo_error
+    assert len(instantanea.obtener()) == 1
+
+
+def test_arranque_desde_disco_con_la_fecha_del_ultimo_refresco(ruta, fuente):
+    instantanea = InstantaneaDatos(ruta, fuente, max_edad_seg=60)
+    instantanea.obtener()
+    os.utime(ruta, (time.time() - 3600, time.time() - 3600))
+
+    # Un refresco sin cambios no reescribe el archivo, pero sí actualiza su fecha
+    fuente.cargas = 0
+    instantanea.invalidar()
+    instantanea.obtener()
+    _esperar_refresco(instantanea)
+
+    reiniciada = InstantaneaDatos(ruta, fuente, max_edad_seg=60)
+    assert reiniciada.edad() < 5
+    assert reiniciada.obtener()["n"].tolist() == ["0"]
+    assert str(reiniciada.df.attrs["generacion"]).startswith("instantanea-")
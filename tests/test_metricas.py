@@ -0,0 +1,75 @@
+import pytest
+
+from metricas import BUCKETS, HandleInstrumentado, Histograma, Metricas, Rerun
+
+
+@pytest.fixture
+def metricas():
+    return Metricas()
+
+
+def test_contadores_por_etiqueta(metricas):
+    metricas.contar("llamadas_total", metodo="get")
+    metricas.contar("llamadas_total", 2, metodo="get")
+    metricas.contar("llamadas_total", metodo="batch_get")
+    assert metricas.valor("llamadas_total", metodo="get") == 3
+    assert metricas.valor("llamadas_total", metodo="batch_get") == 1
+    assert metricas.valor("llamadas_total", metodo="update") == 0
+
+
+def test_cuantil_es_el_limite_del_bucket():
+    histograma = Histograma()
+    for valor in (0.002, 0.003, 0.2, 20):
+        histograma.observar(valor)
+    assert histograma.cuantil(0.5) == 0.005
+    assert histograma.cuantil(0.75) == 0.25
+    assert histograma.cuantil(1) == float("inf")
+
+
+def test_exportacion_prometheus(metricas):
+    metricas.contar("sheets_llamadas_total", metodo="get")
+    metricas.observar("sheets_latencia_segundos", 0.02, metodo="get")
+    metricas.observar("sheets_latencia_segundos", 30, metodo="get")
+    lineas = metricas.exportar_prometheus().splitlines()
+
+    assert 'sheets_llamadas_total{metodo="get"} 1' in lineas
+    buckets = [l for l in lineas if l.startswith("sheets_latencia_segundos_bucket")]
+    assert len(buckets) == len(BUCKETS) + 1
+    assert 'sheets_latencia_segundos_bucket{metodo="get",le="0.025"} 1' in lineas
+    assert 'sheets_latencia_segundos_bucket{metodo="get",le="+Inf"} 2' in lineas
+    assert 'sheets_latencia_segundos_sum{metodo="get"} 30.020000' in lineas
+    assert 'sheets_latencia_segundos_count{metodo="get"} 2' in lineas
+
+
+def test_rerun_registra_fases_y_total(metricas, caplog):
+    rerun = Rerun(metricas)
+    rerun.etiquetas["modo"] = "RH"
+    with rerun.fase("cargar_datos"):
+        pass
+    with pytest.raises(ValueError), rerun.fase("tabla"):
+        raise ValueError  # Una fase que falla también se mide
+    with caplog.at_level("INFO", logger="metricas"):
+        rerun.finalizar()
+
+    assert set(rerun.fases) == {"cargar_datos", "tabla"}
+    assert ("rerun_segundos", (("modo", "RH"),)) in metricas.histogramas
+    assert '"evento": "rerun"' in caplog.text
+
+
+def test_handle_instrumentado_cuenta_errores(metricas, error_api):
+    class Hoja:
+        title = "trabajadores"
+
+        def get(self):
+            return [["a"]]
+
+        def batch_get(self):
+            raise error_api(429)
+
+    hoja = HandleInstrumentado(Hoja(), metricas)
+    assert hoja.title == "trabajadores" and hoja.get() == [["a"]]
+    with pytest.raises(Exception):
+        hoja.batch_get()
+    assert metricas.valor("sheets_llamadas_total", metodo="get") == 1
+    assert metricas.valor("sheets_llamadas_total", metodo="batch_get") == 1
+    assert metricas.valor("sheets_errores_total", metodo="batch_get", codigo="429") == 1
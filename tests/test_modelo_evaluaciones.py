@@ -0,0 +1,52 @@
+import pandas as pd
+
+from modelo_evaluaciones import (
+    COL_AREA, COL_PERIODO, ENCABEZADOS_EVALUACION, normalizar, normalizar_incremental,
+)
+
+
+def _crudo(filas, generacion=1):
+    df = pd.DataFrame(filas, columns=ENCABEZADOS_EVALUACION)
+    df["Mes"], df["Año"], df["Puntaje total"] = "3", "2025", "40"
+    df.attrs["generacion"] = generacion
+    return df
+
+
+def test_frame_sin_columnas():
+    df = normalizar(pd.DataFrame())
+    assert df.empty and df.attrs["columnas"]["puntaje"] is None
+
+
+def test_normalizar_tipa_columnas(fila_evaluacion):
+    df = normalizar(_crudo([fila_evaluacion(0)]))
+    assert df[COL_AREA].dtype == "category"
+    assert df["Puntaje total"].dtype == "float32"
+    assert str(df[COL_PERIODO].iloc[0]) == "2025-03"
+
+
+def test_incremental_equivale_a_normalizar_todo(fila_evaluacion):
+    previo = normalizar(_crudo([fila_evaluacion(n) for n in range(3)]))
+    crudo = _crudo([fila_evaluacion(n) for n in range(3)] + [fila_evaluacion(3, area="Área nueva")])
+
+    df = normalizar_incremental(crudo, previo)
+    pd.testing.assert_frame_equal(df, normalizar(crudo))
+    assert list(df[COL_AREA].cat.categories) == ["Área 1", "Área nueva"]
+    assert normalizar_incremental(crudo, df) is df  # Sin filas nuevas: se reutiliza
+
+
+def test_categorias_nuevas_ordenan_alfabeticamente(fila_evaluacion):
+    filas = [fila_evaluacion(n) for n in range(2)]
+    filas[0][0], filas[1][0] = "Zeta", "Mario"
+    previo = normalizar(_crudo(filas))
+    nueva = fila_evaluacion(2)
+    nueva[0] = "Ana"
+    df = normalizar_incremental(_crudo(filas + [nueva]), previo)
+    assert df.sort_values("Nombre(s) y Apellidos:")["Nombre(s) y Apellidos:"].tolist() == ["Ana", "Mario", "Zeta"]
+
+
+def test_incremental_rehace_todo_si_cambia_la_generacion(fila_evaluacion):
+    previo = normalizar(_crudo([fila_evaluacion(0)], generacion=1))
+    crudo = _crudo([fila_evaluacion(5), fila_evaluacion(6)], generacion=2)
+    df = normalizar_incremental(crudo, previo)
+    assert df["Nombre(s) y Apellidos:"].tolist() == ["Trabajador 5", "Trabajador 6"]
+    assert df.attrs["generacion"] == 2
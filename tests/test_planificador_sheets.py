@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+from gspread.exceptions import APIError
+
+from planificador_sheets import CubetaTokens, PlanificadorSheets
+
+
+def _falla(error_api, codigos):
+    """Función que lanza los errores de ``codigos`` en orden y luego responde "ok"."""
+    llamadas = []
+
+    def funcion():
+        llamadas.append(1)
+        if len(llamadas) <= len(codigos):
+            raise error_api(codigos[len(llamadas) - 1])
+        return "ok"
+    return funcion, llamadas
+
+
+@pytest.fixture
+def planificador():
+    return PlanificadorSheets(0, 0, espera_base=0.001, espera_max=0.001)
+
+
+def test_lectura_reintenta_429_y_5xx(planificador, error_api):
+    funcion, llamadas = _falla(error_api, [429, 503])
+    assert planificador.ejecutar("batch_get", funcion) == "ok"
+    assert len(llamadas) == 3
+
+
+def test_escritura_solo_reintenta_429(planificador, error_api):
+    funcion, llamadas = _falla(error_api, [429])
+    assert planificador.ejecutar("values_append", funcion) == "ok"
+    assert len(llamadas) == 2
+
+    funcion, llamadas = _falla(error_api, [503])
+    with pytest.raises(APIError):
+        planificador.ejecutar("values_append", funcion)
+    assert len(llamadas) == 1  # Pudo haberse aplicado: no se repite
+
+
+def test_error_permanente_no_se_reintenta(planificador, error_api):
+    funcion, llamadas = _falla(error_api, [400])
+    with pytest.raises(APIError):
+        planificador.ejecutar("batch_get", funcion)
+    assert len(llamadas) == 1
+
+
+def test_lecturas_identicas_se_unen(planificador):
+    liberar, llamadas = threading.Event(), []
+
+    def lenta():
+        llamadas.append(1)
+        liberar.wait(1)
+        return "datos"
+
+    resultados = []
+    hilos = [threading.Thread(target=lambda: resultados.append(planificador.ejecutar("get", lenta, clave="A1")))
+             for _ in range(3)]
+    for hilo in hilos:
+        hilo.start()
+    time.sleep(0.05)
+    liberar.set()
+    for hilo in hilos:
+        hilo.join()
+    assert resultados == ["datos"] * 3 and len(llamadas) == 1
+
+
+def test_cubeta_respeta_la_cuota():
+    cubeta = CubetaTokens(60)
+    cubeta.tokens = 0
+    assert cubeta.tomar() > 0.5
+    assert CubetaTokens(0).tomar() == 0
@@ -0,0 +1,35 @@
+import threading
+import time
+
+from planificador_sheets import PlanificadorSheets
+from recursos_sheets import RecursosSheets
+
+
+def _recursos(cliente):
+    return RecursosSheets(None, "x", client=cliente, planificador=PlanificadorSheets(0, 0))
+
+
+def test_handles_y_encabezado_en_cache(cliente):
+    recursos = _recursos(cliente)
+    assert recursos.hoja("trabajadores") is recursos.hoja("trabajadores")
+    encabezados = recursos.encabezados("trabajadores")
+    assert recursos.encabezados("trabajadores") == encabezados
+    assert cliente.llamadas["open_by_key"] == 1
+    assert cliente.llamadas["worksheet"] == 1
+    assert cliente.llamadas["row_values"] == 1
+
+
+def test_apertura_lenta_no_bloquea_la_cache(cliente):
+    recursos = _recursos(cliente)
+    recursos.actualizar_encabezados("trabajadores", ["A"])
+    cliente.latencia["lectura"] = 0.5  # p. ej. esperando cuota o un reintento
+
+    hilo = threading.Thread(target=recursos.hoja, args=("trabajadores",))
+    hilo.start()
+    time.sleep(0.05)
+    inicio = time.perf_counter()
+    assert recursos.encabezados_en_cache("trabajadores") == ["A"]
+    recursos.actualizar_encabezados("trabajadores", ["A", "B"])
+    assert time.perf_counter() - inicio < 0.1
+    hilo.join()
+    assert cliente.llamadas["open_by_key"] == 1
@@ -0,0 +1,58 @@
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+from modelo_evaluaciones import ENCABEZADOS_EVALUACION, FACTORES, PUNTAJE_MAXIMO, normalizar
+from reportes import generar_reportes, nombre_archivo, preparar_tareas
+
+
+@pytest.fixture
+def df():
+    """Dos áreas; Ana con dos periodos, Beto y Caro con uno (puntaje = 12 × factor)."""
+    filas = [("A", "Ana", 1, 4), ("A", "Ana", 2, 2), ("A", "Beto", 1, 1), ("B", "Caro", 3, 3)]
+    crudo = pd.DataFrame(
+        [[nombre, "", "", "", area, "Analista", "5"] + [""] * 12 + ["1", str(mes), "2025"] + ["0"] * 6
+         + [str(factor)] * len(FACTORES) + [str(factor * len(FACTORES)), ""]
+         for area, nombre, mes, factor in filas],
+        columns=ENCABEZADOS_EVALUACION,
+    )
+    return normalizar(crudo)
+
+
+def test_tareas_por_trabajador_y_area(df):
+    tareas = preparar_tareas(df)
+    trabajadores = {d["nombre"]: d for tipo, d in tareas if tipo == "trabajador"}
+    areas = {d["area"]: d for tipo, d in tareas if tipo == "area"}
+
+    assert set(trabajadores) == {"Ana", "Beto", "Caro"} and set(areas) == {"A", "B"}
+    ana = trabajadores["Ana"]
+    assert ana["promedio"] == pytest.approx(36) and ana["puesto"] == "Analista"
+    assert ana["periodos"] == ["1/2025", "2/2025"] and ana["promedios_periodo"] == [48, 24]
+    assert ana["factores"][FACTORES[0]] == pytest.approx(3)
+    assert ana["evaluaciones"] == [("1/2025", 48.0), ("2/2025", 24.0)]
+
+    area = areas["A"]
+    assert area["n"] == 3 and area["mediana"] == 24 and (area["min"], area["max"]) == (12, 48)
+    assert area["trabajadores"] == [("Ana", 2, 36.0), ("Beto", 1, 12.0)]
+
+
+def test_sin_columna_de_puntaje():
+    assert preparar_tareas(normalizar(pd.DataFrame({"Otra": ["x"]}))) == []
+
+
+def test_zip_con_indice(df):
+    destino = io.BytesIO()
+    assert generar_reportes(df, destino, procesos=1, tamano_lote=2) == 5
+    archivo = zipfile.ZipFile(destino)
+    assert sorted(archivo.namelist()) == [
+        "areas/A.html", "areas/B.html", "index.html",
+        "trabajadores/A/Ana.html", "trabajadores/A/Beto.html", "trabajadores/B/Caro.html",
+    ]
+    assert f"36.00/{PUNTAJE_MAXIMO}" in archivo.read("trabajadores/A/Ana.html").decode("utf-8")
+
+
+def test_nombre_archivo():
+    assert nombre_archivo("Área de Finanzas / Norte") == "Área_de_Finanzas_Norte"
+    assert nombre_archivo("///") == "sin_nombre"
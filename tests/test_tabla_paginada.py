@@ -0,0 +1,55 @@
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+from modelo_evaluaciones import COL_AREA, COL_NOMBRE, normalizar_incremental
+from tabla_paginada import buscar, pagina
+
+
+def _tabla(df, clave="tabla"):
+    from modelo_evaluaciones import COL_AREA, COL_NOMBRE
+    from tabla_paginada import mostrar_tabla_paginada
+
+    mostrar_tabla_paginada(df, [COL_NOMBRE, COL_AREA], clave=clave)
+
+
+def _frame(n=60):
+    nombres = ["Zeta", "mario", "Ana"]
+    return pd.DataFrame({
+        COL_NOMBRE: [f"{nombres[i % 3]} {i}" for i in range(n)],
+        COL_AREA: ["Ventas" if i % 2 else "Finanzas" for i in range(n)],
+        "Puntaje": [float(i) for i in range(n)],
+    })
+
+
+def test_busqueda_sin_distinguir_mayusculas():
+    df = pd.DataFrame({"Nombre": ["Ana", "MARIO", None], "Área": ["Ventas", "Finanzas", "mariscos"]})
+    assert buscar(df, "mar", ["Nombre"])["Área"].tolist() == ["Finanzas"]
+    assert buscar(df, "mar", ["Nombre", "Área"]).index.tolist() == [1, 2]
+    assert buscar(df, "", ["Nombre"]) is df
+    assert buscar(df, "xyz", ["Nombre"]).empty
+
+
+def test_paginas():
+    df = pd.DataFrame({"n": range(60)})
+    assert pagina(df, 1, 25)["n"].tolist() == list(range(25))
+    assert pagina(df, 2, 25)["n"].tolist() == list(range(25, 50))
+    assert pagina(df, 3, 25)["n"].tolist() == list(range(50, 60))
+    assert pagina(df, 4, 25).empty
+
+
+def test_orden_por_categoria_alfabetico():
+    df = normalizar_incremental(pd.DataFrame({COL_NOMBRE: ["Zeta", "Mario", "Ana"], "Puntaje": ["1", "2", "3"]}))
+    app = AppTest.from_function(_tabla, args=(df,)).run()
+    app.selectbox(key="tabla_orden").set_value(COL_NOMBRE).run()
+    assert app.dataframe[0].value[COL_NOMBRE].tolist() == ["Ana", "Mario", "Zeta"]
+
+
+def test_busqueda_ajusta_la_pagina():
+    app = AppTest.from_function(_tabla, args=(_frame(),)).run()
+    assert app.caption[0].value == "60 registros · página 1 de 3"
+    app.number_input(key="tabla_pagina").set_value(3).run()
+    assert len(app.dataframe[0].value) == 10
+
+    app.text_input(key="tabla_buscar").set_value("ZETA").run()
+    assert app.caption[0].value == "20 registros · página 1 de 1"
+    assert app.dataframe[0].value[COL_NOMBRE].str.startswith("Zeta").all()